@@ -16,6 +16,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from data_collectors.social_sentiment_collector import AdvancedSocialSentimentCollector
 from ml_models.intelligent_trading_bot import IntelligentTradingBot, RiskLevel
 from utils.database_manager import DatabaseManager
+from utils.http_session import close_async_session, session_stats
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,7 @@ def get_enhanced_social_sentiment(symbol):
             social_sentiment.get_comprehensive_sentiment(symbol.upper())
         )
         
+        loop.run_until_complete(close_async_session())
         loop.close()
         
         return jsonify({
@@ -186,6 +188,7 @@ def get_comprehensive_analysis(symbol):
             trading_bot.analyze_and_trade(market_data)
         )
         
+        loop.run_until_complete(close_async_session())
         loop.close()
         
         # Prepare comprehensive response
@@ -378,6 +381,82 @@ def get_market_intelligence():
             'message': 'Failed to generate market intelligence'
         }), 500
 
+@enhanced_api.route('/api/enhanced/cache-stats')
+def get_cache_stats():
+    """
+    📦 QUOTE CACHE STATISTICS
+    Hit/miss/refresh counters for the shared quote cache
+    """
+    try:
+        from data_collectors.stock_data_collector import StockDataCollector
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'quote_cache': StockDataCollector.quote_cache.stats(),
+                'timestamp': datetime.now().isoformat()
+            },
+            'message': 'Cache statistics retrieved successfully'
+        })
+
+    except Exception as e:
+        logger.error(f"Cache stats error: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': 'Failed to get cache statistics'
+        }), 500
+
+@enhanced_api.route('/api/enhanced/connection-stats')
+def get_connection_stats():
+    """
+    🔌 HTTP CONNECTION POOL STATISTICS
+    Requests vs. new connections for the pooled provider sessions
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'data': {
+                'http_sessions': session_stats(),
+                'timestamp': datetime.now().isoformat()
+            },
+            'message': 'Connection statistics retrieved successfully'
+        })
+
+    except Exception as e:
+        logger.error(f"Connection stats error: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': 'Failed to get connection statistics'
+        }), 500
+
+@enhanced_api.route('/api/enhanced/provider-health')
+def get_provider_health():
+    """
+    🩺 DATA PROVIDER HEALTH
+    Latency, error rate and circuit state per market data provider
+    """
+    try:
+        from data_collectors.stock_data_collector import StockDataCollector
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'providers': StockDataCollector.router.snapshot(),
+                'timestamp': datetime.now().isoformat()
+            },
+            'message': 'Provider health retrieved successfully'
+        })
+
+    except Exception as e:
+        logger.error(f"Provider health error: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': 'Failed to get provider health'
+        }), 500
+
 # Helper functions
 def _extract_symbol_from_command(command):
     """Extract stock symbol from voice command"""
@@ -8,6 +8,10 @@ import random
 from datetime import datetime, timedelta
 import traceback
 
+from utils.config import Config
+from utils.latest_store import latest_values
+from utils.synthetic_market import default_market
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,62 +43,89 @@ DEFAULT_STOCKS = [
     'BA', 'LMT', 'RTX', 'NOC'
 ]
 
+# Background ingestion daemon (started from __main__ when enabled)
+ingestion_daemon = None
+
+# Database for stored-news search when the daemon is not running (opened on first use)
+news_db = None
+
+def news_database():
+    """Database manager holding ingested news articles"""
+    global news_db
+    if ingestion_daemon:
+        return ingestion_daemon.db_manager
+    if news_db is None:
+        from utils.database_manager import DatabaseManager
+        news_db = DatabaseManager(Config.DATABASE_PATH)
+        news_db.initialize_database()
+    return news_db
+
+def latest_max_age(interval):
+    """How old a value published by the ingestion daemon may be before it is ignored"""
+    return interval * Config.LATEST_VALUE_MAX_AGE_FACTOR
+
 # Demo data generators
 def generate_stock_data(symbol):
     """Generate realistic demo stock data"""
-    base_prices = {
-        # Tech Giants
-        'AAPL': 175.43, 'GOOGL': 2847.92, 'MSFT': 378.85, 'AMZN': 3127.45,
-        'META': 487.23, 'NVDA': 875.28, 'NFLX': 445.67, 'ORCL': 112.45,
-        # Electric Vehicles & Energy
-        'TSLA': 248.73, 'NIO': 8.45, 'RIVN': 12.67, 'LCID': 3.89,
-        # Finance & Banking
-        'JPM': 145.23, 'BAC': 32.78, 'WFC': 42.15, 'GS': 387.92,
-        # Healthcare & Pharma
-        'JNJ': 162.45, 'PFE': 28.67, 'UNH': 523.78, 'ABBV': 147.23,
-        # Consumer & Retail
-        'WMT': 158.92, 'HD': 312.45, 'PG': 152.67, 'KO': 58.23,
-        # Aerospace & Defense
-        'BA': 198.45, 'LMT': 445.67, 'RTX': 89.23, 'NOC': 467.89
-    }
-    
-    base_price = base_prices.get(symbol, 100.0)
-    change_percent = random.uniform(-5.0, 5.0)
-    current_price = base_price * (1 + change_percent / 100)
-    
-    return {
-        'symbol': symbol,
-        'current_price': round(current_price, 2),
-        'change_percent': round(change_percent, 2),
-        'volume': random.randint(1000000, 50000000),
-        'market_cap': f"${random.randint(500, 3000)}B",
-        'pe_ratio': round(random.uniform(15, 35), 1),
-        'high_52w': round(current_price * 1.3, 2),
-        'low_52w': round(current_price * 0.7, 2),
-        'timestamp': datetime.now().isoformat()
-    }
+    return generate_stocks_data([symbol])[0]
 
-def generate_historical_data(symbol, days=30):
-    """Generate historical price data"""
-    data = []
-    base_price = 100.0
+def generate_stocks_data(symbols):
+    """Stock data for many symbols: ingested quotes first, synthetic market for the rest"""
+    quotes = latest_values.get_many('quote', symbols, latest_max_age(Config.STOCK_DATA_UPDATE_INTERVAL))
+    missing = [symbol for symbol in symbols if symbol not in quotes]
+    if missing:
+        quotes.update(default_market.quotes(missing))
     
-    for i in range(days):
-        date = datetime.now() - timedelta(days=days-i-1)
-        change = random.uniform(-0.05, 0.05)
-        base_price *= (1 + change)
-        
-        data.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'price': round(base_price, 2),
-            'volume': random.randint(1000000, 10000000)
+    stocks_data = []
+    for symbol in symbols:
+        quote = quotes[symbol]
+        current_price = quote['current_price']
+        # Not every provider reports fundamentals (e.g. Alpha Vantage quotes)
+        market_cap = quote.get('market_cap')
+        pe_ratio = quote.get('pe_ratio')
+        stocks_data.append({
+            'symbol': symbol,
+            'current_price': current_price,
+            'change_percent': quote['change_percent'],
+            'volume': quote['volume'],
+            'market_cap': format_market_cap(market_cap),
+            'pe_ratio': round(pe_ratio, 1) if pe_ratio else 'N/A',
+            'high_52w': round(current_price * 1.3, 2),
+            'low_52w': round(current_price * 0.7, 2),
+            'timestamp': quote['timestamp'].isoformat()
         })
     
-    return data
+    return stocks_data
+
+def format_market_cap(market_cap):
+    """Market cap as "$123B" ("$456M" below a billion), or "N/A" when unknown"""
+    if not market_cap:
+        return 'N/A'
+    if market_cap >= 1e9:
+        return f"${round(market_cap / 1e9)}B"
+    return f"${round(market_cap / 1e6)}M"
+
+def generate_historical_data(symbol, days=30, columnar=False):
+    """Generate historical price data (parallel column lists when columnar)"""
+    series = default_market.history_series(symbol, days)
+    if columnar:
+        return series.to_columnar()
+    
+    return [
+        {
+            'date': bar_date,
+            'price': close_price,
+            'volume': volume
+        }
+        for bar_date, close_price, volume in zip(
+            series.date_strings(), series.close.tolist(), series.volume.tolist()
+        )
+    ]
 
 def generate_sentiment_data(symbol):
     """Generate sentiment analysis data"""
-    compound = random.uniform(-1, 1)
+    latest = latest_values.get('sentiment', symbol, latest_max_age(Config.SENTIMENT_UPDATE_INTERVAL))
+    compound = latest['compound_score'] if latest else random.uniform(-1, 1)
     
     if compound > 0.05:
         label = 'Bullish'
@@ -108,9 +139,9 @@ def generate_sentiment_data(symbol):
     
     return {
         'compound': round(compound, 3),
-        'positive': round(random.uniform(0.1, 0.9), 3),
-        'negative': round(random.uniform(0.1, 0.4), 3),
-        'neutral': round(random.uniform(0.1, 0.5), 3),
+        'positive': latest['positive_score'] if latest else round(random.uniform(0.1, 0.9), 3),
+        'negative': latest['negative_score'] if latest else round(random.uniform(0.1, 0.4), 3),
+        'neutral': latest['neutral_score'] if latest else round(random.uniform(0.1, 0.5), 3),
         'label': label,
         'color': color,
         'confidence': round(random.uniform(0.7, 0.95), 3),
@@ -205,10 +236,7 @@ def serve_assets(filename):
 def get_stocks():
     """Get list of available stocks"""
     try:
-        stocks_data = []
-        for symbol in DEFAULT_STOCKS:
-            stock_data = generate_stock_data(symbol)
-            stocks_data.append(stock_data)
+        stocks_data = generate_stocks_data(DEFAULT_STOCKS)
         
         return jsonify({
             'success': True,
@@ -259,19 +287,21 @@ def get_stock_data(symbol):
 
 @app.route('/api/historical/<symbol>')
 def get_historical_data(symbol):
-    """Get historical data for charts"""
+    """Get historical data for charts (?format=columnar for column lists)"""
     try:
         symbol = symbol.upper()
         days = request.args.get('days', 30, type=int)
         days = min(max(days, 1), 365)  # Limit between 1 and 365 days
+        data_format = request.args.get('format', 'records')
         
-        data = generate_historical_data(symbol, days)
+        data = generate_historical_data(symbol, days, columnar=data_format == 'columnar')
         
         return jsonify({
             'success': True,
             'symbol': symbol,
             'data': data,
-            'days': days
+            'days': days,
+            'format': data_format if data_format == 'columnar' else 'records'
         })
         
     except Exception as e:
@@ -282,6 +312,46 @@ def get_historical_data(symbol):
             'symbol': symbol
         }), 500
 
+@app.route('/api/intraday/<symbol>')
+def get_intraday_bars(symbol):
+    """Get intraday candles aggregated from ingested quotes"""
+    try:
+        symbol = symbol.upper()
+        interval = request.args.get('interval', '1m')
+        limit = min(max(request.args.get('limit', 120, type=int), 1), Config.INTRADAY_BAR_CAPACITY)
+        
+        if interval not in Config.INTRADAY_INTERVALS:
+            return jsonify({
+                'success': False,
+                'error': f"Unsupported interval {interval}",
+                'symbol': symbol
+            }), 400
+        
+        if not ingestion_daemon:
+            return jsonify({
+                'success': False,
+                'error': 'Intraday bars require the ingestion daemon (INGESTION_DAEMON_ENABLED=true)',
+                'symbol': symbol
+            }), 503
+        
+        bars = ingestion_daemon.bars.get_bars(symbol, interval, limit)
+        
+        return jsonify({
+            'success': True,
+            'symbol': symbol,
+            'interval': interval,
+            'data': bars.to_columnar(),
+            'count': len(bars)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting intraday bars for {symbol}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'symbol': symbol
+        }), 500
+
 @app.route('/api/sentiment/<symbol>')
 def get_sentiment_analysis(symbol):
     """Get detailed sentiment analysis"""
@@ -336,12 +406,70 @@ def get_predictions(symbol):
             'symbol': symbol
         }), 500
 
+@app.route('/api/news/search')
+def search_news():
+    """Full-text search over stored news articles"""
+    try:
+        query = request.args.get('q', '').strip()
+        symbol = request.args.get('symbol', '').upper() or None
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        
+        if not query:
+            return jsonify({
+                'success': False,
+                'error': 'Missing search query (q)',
+                'articles': [],
+                'count': 0
+            }), 400
+        
+        articles = news_database().search_news(query, symbol=symbol, limit=limit)
+        for article in articles:
+            article['rank'] = round(article['rank'], 4)
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            'symbol': symbol,
+            'articles': articles,
+            'count': len(articles)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error searching news for {request.args.get('q')!r}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'articles': [],
+            'count': 0
+        }), 500
+
 @app.route('/api/news/<symbol>')
 def get_news(symbol):
     """Get news articles for a stock"""
     try:
         symbol = symbol.upper()
         
+        # Articles published by the ingestion daemon
+        latest = latest_values.get('news', symbol, latest_max_age(Config.NEWS_UPDATE_INTERVAL))
+        if latest:
+            news_articles = [
+                {
+                    'title': article.get('title', ''),
+                    'description': article.get('description', ''),
+                    'url': article.get('url', ''),
+                    'source': article.get('source', ''),
+                    'published_date': article.get('published_date', ''),
+                    'sentiment_score': round(article.get('sentiment_score', 0.0), 3)
+                }
+                for article in latest
+            ]
+            return jsonify({
+                'success': True,
+                'symbol': symbol,
+                'articles': news_articles,
+                'count': len(news_articles)
+            })
+        
         # Generate demo news articles
         news_articles = []
         for i in range(random.randint(5, 15)):
@@ -423,7 +551,8 @@ def health_check():
         'services': {
             'api': 'running',
             'database': 'connected',
-            'ml_models': 'loaded'
+            'ml_models': 'loaded',
+            'ingestion': ingestion_daemon.status() if ingestion_daemon else 'disabled'
         }
     })
 
@@ -459,6 +588,12 @@ if __name__ == '__main__':
     logger.info(f"📊 Available stocks: {DEFAULT_STOCKS}")
     logger.info("🌐 Server starting on http://127.0.0.1:5000")
     
+    # With the debug reloader only the child process (WERKZEUG_RUN_MAIN) serves requests
+    if Config.INGESTION_DAEMON_ENABLED and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        from data_collectors.market_data_daemon import MarketDataDaemon
+        ingestion_daemon = MarketDataDaemon(DEFAULT_STOCKS)
+        ingestion_daemon.start()
+    
     try:
         app.run(
             host='0.0.0.0',
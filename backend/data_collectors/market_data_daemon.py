@@ -0,0 +1,235 @@
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+from utils.database_manager import DatabaseManager
+from utils.latest_store import LatestValueStore, latest_values
+from utils.intraday_bars import IntradayBarAggregator
+from utils.write_behind import WriteBehindQueue, BULK_INSERTS
+from utils.synthetic_market import is_simulated
+from data_collectors.stock_data_collector import StockDataCollector
+from data_collectors.news_sentiment_collector import NewsSentimentCollector
+
+logger = logging.getLogger(__name__)
+
+class MarketDataDaemon:
+    """Background ingestion of quotes, news and sentiment for a symbol universe
+
+    Each feed runs on its own thread at its ``Config`` update interval,
+    writes through ``DatabaseManager`` and publishes to a
+    ``LatestValueStore`` that API handlers read from.
+    """
+
+    def __init__(self, symbols: Optional[List[str]] = None, store: Optional[LatestValueStore] = None,
+                 db_manager: Optional[DatabaseManager] = None,
+                 stock_collector: Optional[StockDataCollector] = None,
+                 news_collector: Optional[NewsSentimentCollector] = None):
+        self.symbols = list(symbols or Config.DEFAULT_STOCKS)
+        self.store = store or latest_values
+        self.db_manager = db_manager or StockDataCollector.db_manager
+        self.stock_collector = stock_collector or StockDataCollector()
+        self.news_collector = news_collector or NewsSentimentCollector()
+        self.writer = WriteBehindQueue(self.db_manager) if Config.WRITE_BEHIND_ENABLED else None
+        self.bars = IntradayBarAggregator(self.db_manager, writer=self.writer)
+
+        self.jobs = {
+            'quotes': (Config.STOCK_DATA_UPDATE_INTERVAL, self.refresh_quotes),
+            'news': (Config.NEWS_UPDATE_INTERVAL, self.refresh_news),
+            'sentiment': (Config.SENTIMENT_UPDATE_INTERVAL, self.refresh_sentiment)
+        }
+        if Config.MAINTENANCE_INTERVAL > 0:
+            self.jobs['maintenance'] = (Config.MAINTENANCE_INTERVAL, self.run_maintenance)
+        self.last_maintenance = None
+        self.job_status = {
+            name: {'runs': 0, 'errors': 0, 'last_run': None, 'last_duration': None, 'last_error': None}
+            for name in self.jobs
+        }
+        self._news_api_cursor = 0  # next symbol whose news comes from NewsAPI
+        self._news_api_credit = 0.0
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Start one daemon thread per feed; each refreshes immediately, then on its interval"""
+        if self.running:
+            return
+
+        self.db_manager.initialize_database()
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run_job, args=(name,), name=f"ingest-{name}", daemon=True)
+            for name in self.jobs
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Market data daemon started for {len(self.symbols)} symbols")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self.bars.flush()
+        if self.writer is not None:
+            self.writer.stop()
+        logger.info("Market data daemon stopped")
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def status(self) -> Dict:
+        return {
+            'running': self.running,
+            'symbols': len(self.symbols),
+            'jobs': {
+                name: dict(status, interval=self.jobs[name][0])
+                for name, status in self.job_status.items()
+            },
+            'store': self.store.stats(),
+            'intraday_bars': self.bars.stats(),
+            'write_behind': self.writer.stats() if self.writer is not None else None,
+            'maintenance': self.last_maintenance
+        }
+
+    def refresh_quotes(self):
+        quotes = self.stock_collector.get_multiple_stocks_data(self.symbols)
+
+        # Simulated fallback quotes (provider outage) are neither stored nor published
+        quotes = {symbol: quote for symbol, quote in quotes.items() if not is_simulated(quote)}
+
+        # Ticks become 1m/5m/1h bars; closed 1m bars reach stock_data in batches
+        self.bars.add_quotes(quotes)
+        self.bars.close_idle()
+        self.bars.flush()
+
+        # Live prices for portfolio valuation, ahead of the next closed bar
+        self._write('latest_prices', [
+            {
+                'symbol': symbol,
+                'price': quote['current_price'],
+                'timestamp': quote.get('timestamp') or datetime.now(),
+                'source': quote.get('source')
+            }
+            for symbol, quote in quotes.items()
+        ])
+
+        self.store.publish_many('quote', quotes)
+
+    def refresh_news(self):
+        api_symbols = self._news_api_turn()
+        for symbol in self.symbols:
+            if self._stop.is_set():
+                return
+
+            articles = self.news_collector.get_news_articles(symbol, use_api=symbol in api_symbols)
+            rows = []
+            for article in articles:
+                article['sentiment_score'] = self.news_collector._analyze_sentiment(
+                    (article.get('title') or '') + ' ' + (article.get('description') or '')
+                )['compound']
+                rows.append({
+                    'symbol': symbol,
+                    'title': article.get('title', ''),
+                    'url': article.get('url', ''),
+                    'source': article.get('source', ''),
+                    'published_date': article.get('published_date', ''),
+                    'content': article.get('description', ''),
+                    'sentiment_score': article['sentiment_score']
+                })
+
+            self._write('news_articles', rows)
+            self.store.publish('news', symbol, articles)
+
+    def _news_api_turn(self) -> set:
+        """Symbols that may query NewsAPI this cycle; the others use RSS only
+
+        The daemon's share of the news_api budget is spread over its cycles
+        and handed out round-robin, so it never exhausts the budget (and
+        never blocks on the rate limiter) however many symbols it follows.
+        """
+        if 'news_api' not in Config.RATE_LIMITS or not self.symbols:
+            return set(self.symbols)
+        capacity, period = Config.RATE_LIMITS['news_api']
+        calls = capacity * Config.NEWS_API_DAEMON_SHARE * Config.NEWS_UPDATE_INTERVAL / period
+        calls += self._news_api_credit
+        count = min(int(calls), len(self.symbols))
+        self._news_api_credit = min(calls - count, 1.0)
+
+        turn = {self.symbols[(self._news_api_cursor + i) % len(self.symbols)] for i in range(count)}
+        self._news_api_cursor = (self._news_api_cursor + count) % len(self.symbols)
+        return turn
+
+    def refresh_sentiment(self):
+        rows = []
+        for symbol in self.symbols:
+            if self._stop.is_set():
+                break
+
+            # Reuse the articles the news feed already fetched when they are fresh
+            articles = self.store.get('news', symbol, max_age=Config.NEWS_UPDATE_INTERVAL)
+            if articles is None:
+                sentiment = self.news_collector.get_sentiment_for_stock(symbol)
+            else:
+                sentiment = self.news_collector.aggregate_sentiment(symbol, articles)
+            if is_simulated(sentiment):
+                continue
+
+            rows.append({
+                'symbol': symbol,
+                'timestamp': sentiment['timestamp'],
+                'source': sentiment['source'],
+                'content': f"{sentiment['news_count']} articles",
+                'sentiment_score': sentiment['compound_score'],
+                'sentiment_label': sentiment['sentiment_label'],
+                'compound_score': sentiment['compound_score'],
+                'positive_score': sentiment['positive_score'],
+                'negative_score': sentiment['negative_score'],
+                'neutral_score': sentiment['neutral_score']
+            })
+            self.store.publish('sentiment', symbol, sentiment)
+
+        self._write('sentiment_data', rows)
+
+    def run_maintenance(self):
+        # Flush buffered rows first so retention sees everything ingested so far
+        self.bars.flush()
+        if self.writer is not None:
+            self.writer.flush()
+        self.last_maintenance = self.db_manager.run_maintenance()
+
+    def _write(self, table: str, rows: List[Dict]):
+        """Insert rows in one batch, through the write-behind queue when enabled"""
+        if not rows:
+            return
+        if self.writer is not None:
+            self.writer.put_many(table, rows)
+        else:
+            getattr(self.db_manager, BULK_INSERTS[table])(rows)
+
+    def _run_job(self, name: str):
+        interval, job = self.jobs[name]
+        status = self.job_status[name]
+
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                job()
+            except Exception as e:
+                status['errors'] += 1
+                status['last_error'] = str(e)
+                logger.error(f"Ingestion job {name} failed: {e}")
+
+            status['runs'] += 1
+            status['last_run'] = datetime.now().isoformat()
+            status['last_duration'] = round(time.monotonic() - started, 3)
+
+            # Keep a fixed cadence; a slow run shortens the wait instead of drifting
+            self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
@@ -1,4 +1,3 @@
-import requests
 import feedparser
 import pandas as pd
 import numpy as np
@@ -29,6 +28,11 @@ except:
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.config import Config
+from utils.rate_limiter import TokenBucketLimiter
+from utils.lazy_shared import LazyShared
+from utils.http_session import get_session
+from utils.provider_tape import provider_tape, REPLAY
+from utils.synthetic_market import SIMULATED_SOURCE
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format=Config.LOG_FORMAT)
@@ -37,6 +41,10 @@ logger = logging.getLogger(__name__)
 class NewsSentimentCollector:
     """Collects news and performs sentiment analysis"""
     
+    # Provider rate limits shared with every collector and worker process,
+    # opened on first use rather than on import
+    rate_limiter = LazyShared(lambda cls: TokenBucketLimiter())
+    
     def __init__(self):
         self.config = Config()
         self.news_api_key = self.config.get_api_key('news_api')
@@ -76,19 +84,30 @@ class NewsSentimentCollector:
     def get_sentiment_for_stock(self, symbol: str) -> Dict:
         """Get sentiment analysis for a specific stock"""
         try:
-            # Collect news from multiple sources
-            news_articles = []
-            
-            # Get news from APIs
-            api_news = self._get_news_api_data(symbol)
-            if api_news:
-                news_articles.extend(api_news)
-            
-            # Get news from RSS feeds
-            rss_news = self._get_rss_news(symbol)
-            if rss_news:
-                news_articles.extend(rss_news)
-            
+            return self.aggregate_sentiment(symbol, self.get_news_articles(symbol))
+        except Exception as e:
+            logger.error(f"Error getting sentiment for {symbol}: {e}")
+            return self._generate_simulated_sentiment(symbol)
+    
+    def get_news_articles(self, symbol: str, use_api: bool = True) -> List[Dict]:
+        """Collect news for a stock from News API (unless ``use_api`` is False) and RSS feeds"""
+        news_articles = []
+        
+        # Get news from APIs
+        api_news = self._get_news_api_data(symbol) if use_api else []
+        if api_news:
+            news_articles.extend(api_news)
+        
+        # Get news from RSS feeds
+        rss_news = self._get_rss_news(symbol)
+        if rss_news:
+            news_articles.extend(rss_news)
+        
+        return news_articles
+    
+    def aggregate_sentiment(self, symbol: str, news_articles: List[Dict]) -> Dict:
+        """Aggregate article-level sentiment into one score for a stock"""
+        try:
             # If no real news found, generate simulated sentiment
             if not news_articles:
                 return self._generate_simulated_sentiment(symbol)
@@ -132,7 +151,7 @@ class NewsSentimentCollector:
                 return self._generate_simulated_sentiment(symbol)
                 
         except Exception as e:
-            logger.error(f"Error getting sentiment for {symbol}: {e}")
+            logger.error(f"Error aggregating sentiment for {symbol}: {e}")
             return self._generate_simulated_sentiment(symbol)
     
     def _get_news_api_data(self, symbol: str) -> List[Dict]:
@@ -141,6 +160,9 @@ class NewsSentimentCollector:
             if self.news_api_key == 'your_news_api_key':
                 return []
             
+            if provider_tape.mode != REPLAY and not self.rate_limiter.acquire('news_api'):
+                return []
+            
             # Search for stock-related news
             keywords = self.stock_keywords.get(symbol, [symbol])
             query = ' OR '.join(keywords)
@@ -154,7 +176,7 @@ class NewsSentimentCollector:
                 'apiKey': self.news_api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = provider_tape.http_get('news_api', get_session(), url, params=params, timeout=10)
             
             if response.status_code != 200:
                 return []
@@ -186,7 +208,7 @@ class NewsSentimentCollector:
             
             for feed_url in self.rss_feeds[:2]:  # Limit to 2 feeds to avoid being slow
                 try:
-                    feed = feedparser.parse(feed_url)
+                    feed = feedparser.parse(provider_tape.http_get('rss', get_session(), feed_url, timeout=10).content)
                     
                     for entry in feed.entries[:5]:  # Limit to 5 entries per feed
                         title = entry.get('title', '')
@@ -335,7 +357,7 @@ class NewsSentimentCollector:
             'sentiment_label': label,
             'news_count': np.random.randint(5, 15),
             'timestamp': datetime.now(),
-            'source': 'simulated'
+            'source': SIMULATED_SOURCE
         }
     
     def get_detailed_sentiment(self, symbol: str) -> Dict:
@@ -456,7 +478,7 @@ class NewsSentimentCollector:
                     'pageSize': 1,
                     'apiKey': self.news_api_key
                 }
-                response = requests.get(url, params=params, timeout=10)
+                response = get_session().get(url, params=params, timeout=10)
                 results['news_api'] = response.status_code == 200
             else:
                 results['news_api'] = False
@@ -465,7 +487,7 @@ class NewsSentimentCollector:
         
         # Test RSS feeds
         try:
-            feed = feedparser.parse(self.rss_feeds[0])
+            feed = feedparser.parse(get_session().get(self.rss_feeds[0], timeout=10).content)
             results['rss_feeds'] = len(feed.entries) > 0
         except:
             results['rss_feeds'] = False
@@ -12,16 +12,64 @@ import numpy as np
 from textblob import TextBlob
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import re
+import sys
 import logging
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from typing import Dict, List
 import asyncio
-import aiohttp
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 import torch
 
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.http_session import async_session
+from utils.provider_tape import provider_tape, REPLAY
+
 logger = logging.getLogger(__name__)
 
+class _RecordedComments(list):
+    """Replayed Reddit comment list (already expanded when recorded)"""
+    
+    def replace_more(self, limit=None):
+        return []
+
+def _encode_tweets(response) -> List[Dict]:
+    return [
+        {'text': tweet.text, 'public_metrics': tweet.public_metrics}
+        for tweet in (response.data or [])
+    ]
+
+def _decode_tweets(tweets: List[Dict]):
+    return SimpleNamespace(data=[SimpleNamespace(**tweet) for tweet in tweets] or None)
+
+def _encode_posts(posts) -> List[Dict]:
+    encoded = []
+    for post in posts:
+        post.comments.replace_more(limit=0)
+        encoded.append({
+            'title': post.title,
+            'selftext': post.selftext,
+            'score': post.score,
+            'comments': [
+                {'body': comment.body, 'score': comment.score}
+                for comment in post.comments[:10]
+                if hasattr(comment, 'body')
+            ]
+        })
+    return encoded
+
+def _decode_posts(posts: List[Dict]) -> List:
+    return [
+        SimpleNamespace(
+            title=post['title'],
+            selftext=post['selftext'],
+            score=post['score'],
+            comments=_RecordedComments(SimpleNamespace(**comment) for comment in post['comments'])
+        )
+        for post in posts
+    ]
+
 class AdvancedSocialSentimentCollector:
     """
     🚀 CUTTING-EDGE SOCIAL SENTIMENT ANALYSIS
@@ -126,16 +174,21 @@ class AdvancedSocialSentimentCollector:
     
     async def get_twitter_sentiment(self, symbol: str) -> Dict:
         """Advanced Twitter sentiment analysis"""
-        if not self.twitter_api:
+        if not self.twitter_api and provider_tape.mode != REPLAY:
             return {'source': 'twitter', 'sentiment': 0, 'confidence': 0, 'volume': 0}
         
         try:
             # Search for tweets about the stock
             query = f"${symbol} OR {self._get_company_name(symbol)} -is:retweet lang:en"
-            tweets = self.twitter_api.search_recent_tweets(
-                query=query,
-                max_results=100,
-                tweet_fields=['created_at', 'public_metrics', 'context_annotations']
+            tweets = provider_tape.call(
+                'twitter', query,
+                lambda: self.twitter_api.search_recent_tweets(
+                    query=query,
+                    max_results=100,
+                    tweet_fields=['created_at', 'public_metrics', 'context_annotations']
+                ),
+                encode=_encode_tweets,
+                decode=_decode_tweets
             )
             
             if not tweets.data:
@@ -200,7 +253,7 @@ class AdvancedSocialSentimentCollector:
     
     async def get_reddit_sentiment(self, symbol: str) -> Dict:
         """Advanced Reddit sentiment from WallStreetBets and other finance subreddits"""
-        if not self.reddit_api:
+        if not self.reddit_api and provider_tape.mode != REPLAY:
             return {'source': 'reddit', 'sentiment': 0, 'confidence': 0, 'volume': 0}
         
         try:
@@ -210,10 +263,16 @@ class AdvancedSocialSentimentCollector:
             
             for subreddit_name in subreddits:
                 try:
-                    subreddit = self.reddit_api.subreddit(subreddit_name)
-                    
                     # Search for posts about the stock
-                    for post in subreddit.search(f"{symbol}", time_filter='day', limit=50):
+                    posts = provider_tape.call(
+                        'reddit', f"{subreddit_name}:{symbol}",
+                        lambda: list(self.reddit_api.subreddit(subreddit_name).search(
+                            f"{symbol}", time_filter='day', limit=50
+                        )),
+                        encode=_encode_posts,
+                        decode=_decode_posts
+                    )
+                    for post in posts:
                         # Analyze post title and content
                         text = f"{post.title} {post.selftext}"
                         text = self._clean_text(text)
@@ -308,13 +367,17 @@ class AdvancedSocialSentimentCollector:
             
             all_articles = []
             
-            async with aiohttp.ClientSession() as session:
+            async with async_session() as session:
                 for source in news_sources:
                     try:
-                        async with session.get(source) as response:
-                            # Parse RSS feed and extract articles about the symbol
-                            # This is simplified - you'd use feedparser here
-                            pass
+                        async def fetch(source=source):
+                            async with session.get(source) as response:
+                                # Parse RSS feed and extract articles about the symbol
+                                # This is simplified - you'd use feedparser here
+                                # (reading the body lets the connection return to the pool)
+                                return await response.read()
+                        
+                        await provider_tape.acall('rss', source, fetch)
                     except:
                         continue
             
@@ -1,18 +1,28 @@
 import yfinance as yf
-import requests
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
-import time
 import logging
-from typing import Dict, List, Optional
-import json
+from typing import Dict, List, Optional, Union
 import sys
 import os
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.config import Config
+from utils.quote_cache import QuoteCache
+from utils.fundamentals_store import FundamentalsStore
+from utils.history_cache import HistoryCache
+from utils.database_manager import DatabaseManager
+from utils.rate_limiter import TokenBucketLimiter
+from utils.lazy_shared import LazyShared
+from utils.http_session import get_session
+from utils.provider_router import ProviderRouter, ProviderError
+from utils.synthetic_market import default_market, is_simulated
+from utils.bars import BarSeries
+from utils.provider_tape import provider_tape, REPLAY
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format=Config.LOG_FORMAT)
@@ -20,41 +30,230 @@ logger = logging.getLogger(__name__)
 
 class StockDataCollector:
     """Collects real-time stock market data from multiple sources"""
-    
-    def __init__(self):
+
+    # Shared by all collector instances so blocking provider calls made by
+    # the async engine never exceed the configured fan-out
+    _executor = ThreadPoolExecutor(
+        max_workers=Config.STOCK_FETCH_CONCURRENCY,
+        thread_name_prefix='stock-fetch'
+    )
+
+    # Process-wide quote cache shared by every collector instance; simulated
+    # fallback quotes expire quickly so providers are retried soon
+    quote_cache = QuoteCache(
+        ttl_for=lambda quote: Config.SIMULATED_QUOTE_TTL if is_simulated(quote) else None
+    )
+
+    # Index/sector snapshots: one batched upstream call per TTL
+    overview_cache = QuoteCache(ttl=Config.MARKET_OVERVIEW_TTL, max_size=16, refresh_workers=1)
+
+    # Database-backed resources are opened on first use, not on import
+    db_manager = LazyShared(lambda cls: DatabaseManager(Config.DATABASE_PATH))
+
+    # Market cap / P/E are joined from memory instead of calling ticker.info
+    fundamentals = LazyShared(lambda cls: FundamentalsStore(cls.db_manager))
+
+    # Local daily bars; only missing date ranges are downloaded
+    history_cache = LazyShared(lambda cls: HistoryCache(cls.db_manager))
+
+    # Provider rate limits shared with every collector and worker process
+    rate_limiter = LazyShared(lambda cls: TokenBucketLimiter())
+
+    # Rolling provider latency/error stats and circuit breakers
+    router = ProviderRouter()
+
+    def __init__(self, quote_cache: Optional[QuoteCache] = None):
         self.config = Config()
         self.alpha_vantage_key = self.config.get_api_key('alpha_vantage')
         self.polygon_key = self.config.get_api_key('polygon')
-        self.last_request_time = {}
-        self.request_count = {}
-        
+        self._loop_semaphores = weakref.WeakKeyDictionary()
+        if quote_cache is not None:
+            self.quote_cache = quote_cache
+
     def get_current_data(self, symbol: str) -> Dict:
         """Get current stock data for a symbol"""
+        return self.quote_cache.get_or_fetch(symbol, self._fetch_current_data)
+
+    def _fetch_current_data(self, symbol: str) -> Dict:
+        """Fetch current data from the providers, bypassing the quote cache"""
+        return self._run_sync(self.aget_current_data(symbol))
+
+    async def aget_current_data(self, symbol: str, deadline: Optional[float] = None) -> Dict:
+        """Get current stock data for a symbol without blocking the event loop
+
+        Providers are tried fastest-healthy-first as ranked by the provider
+        router (providers with an open circuit are skipped), each under its own
+        semaphore and per-call timeout, falling back to simulated data.
+        ``deadline`` is an absolute ``loop.time()`` after which remaining
+        providers are skipped.
+        """
+        loop = asyncio.get_running_loop()
         try:
-            # Try Yahoo Finance first (free and reliable)
-            data = self._get_yahoo_data(symbol)
-            if data:
-                return data
-                
-            # Fallback to Alpha Vantage
-            data = self._get_alpha_vantage_data(symbol)
-            if data:
-                return data
-                
-            # Fallback to simulated data for demo
-            return self._get_simulated_data(symbol)
-            
+            providers = {
+                'yahoo_finance': self._get_yahoo_data,
+                'alpha_vantage': self._get_alpha_vantage_data
+            }
+            order = self.router.route(list(providers))
+            tried = set()
+
+            for index, provider in enumerate(order):
+                if provider in tried:
+                    continue
+
+                timeout = self.config.STOCK_FETCH_TIMEOUT
+                if deadline is not None:
+                    timeout = min(timeout, deadline - loop.time())
+                    if timeout <= 0:
+                        break
+
+                hedge = None
+                if self.config.HEDGE_ENABLED:
+                    hedge = next((p for p in order[index + 1:] if p not in tried), None)
+
+                data, attempted = await self._call_hedged(provider, hedge, providers, symbol, timeout)
+                tried.update(attempted)
+                if data:
+                    return data
+
+            # Fallback to simulated data for demo, with the reason attached
+            data = self._get_simulated_data(symbol)
+            data['provider_health'] = self.router.snapshot()
+            return data
+
         except Exception as e:
             logger.error(f"Error getting current data for {symbol}: {e}")
             return self._get_simulated_data(symbol)
+
+    async def aget_many(self, symbols: List[str], concurrency: Optional[int] = None,
+                        timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """Get current data for many symbols concurrently
+
+        At most ``concurrency`` symbols are in flight at once (defaults to
+        ``Config.STOCK_FETCH_CONCURRENCY``); ``timeout`` bounds the whole fan-out.
+        """
+        loop = asyncio.get_running_loop()
+        limit = asyncio.Semaphore(concurrency or self.config.STOCK_FETCH_CONCURRENCY)
+        deadline = loop.time() + timeout if timeout is not None else None
+
+        async def fetch(symbol):
+            async with limit:
+                return await self.aget_current_data(symbol, deadline=deadline)
+
+        unique_symbols = list(dict.fromkeys(symbols))
+        responses = await asyncio.gather(
+            *(fetch(symbol) for symbol in unique_symbols),
+            return_exceptions=True
+        )
+
+        results = {}
+        for symbol, data in zip(unique_symbols, responses):
+            if isinstance(data, Exception):
+                logger.error(f"Error getting data for {symbol}: {data}")
+            elif data:
+                results[symbol] = data
+
+        return results
+
+    async def _call_hedged(self, primary: str, hedge: Optional[str], providers: Dict,
+                           symbol: str, timeout: float):
+        """Call primary; if it runs past its hedge latency, race the hedge provider too
+
+        Returns the first non-empty result and the providers that were tried.
+        """
+        delay = self.router.hedge_delay(primary) if hedge else None
+        primary_task = asyncio.ensure_future(
+            self._call_provider(primary, providers[primary], symbol, timeout)
+        )
+        if delay is None or delay >= timeout:
+            return await primary_task, [primary]
+
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done:
+            return primary_task.result(), [primary]
+
+        hedge_task = asyncio.ensure_future(
+            self._call_provider(hedge, providers[hedge], symbol, timeout - delay)
+        )
+        pending = {primary_task, hedge_task}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                data = task.result()
+                if data:
+                    for other in pending:
+                        other.cancel()
+                    return data, [primary, hedge]
+
+        return None, [primary, hedge]
+
+    async def _call_provider(self, provider: str, fetch, symbol: str, timeout: float) -> Optional[Dict]:
+        """Run a blocking provider call on the shared executor under its semaphore
+
+        Only timeouts and ``ProviderError``s (transport/HTTP failures) count
+        against the provider; no data for a symbol (e.g. an unknown ticker)
+        does not.
+        """
+        if not self.router.begin(provider):
+            return None
+
+        loop = asyncio.get_running_loop()
+        async with self._provider_semaphore(provider):
+            started = loop.time()
+            try:
+                data = await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, fetch, symbol),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"{provider} timed out after {timeout:.1f}s for {symbol}")
+                self.router.record(provider, loop.time() - started, False, f"timeout after {timeout:.1f}s")
+                return None
+            except ProviderError as e:
+                logger.error(f"{provider} error for {symbol}: {e}")
+                self.router.record(provider, loop.time() - started, False, str(e))
+                return None
+            except BaseException:
+                self.router.release(provider)
+                raise
+
+        if data:
+            self.router.record(provider, loop.time() - started, True)
+        else:
+            self.router.release(provider)
+        return data
+
+    def _provider_semaphore(self, provider: str) -> asyncio.Semaphore:
+        """Get the per-provider semaphore bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphores = self._loop_semaphores.setdefault(loop, {})
+        if provider not in semaphores:
+            limit = self.config.PROVIDER_CONCURRENCY.get(provider, self.config.STOCK_FETCH_CONCURRENCY)
+            semaphores[provider] = asyncio.Semaphore(limit)
+        return semaphores[provider]
+
+    @staticmethod
+    def _run_sync(coro):
+        """Run a coroutine to completion from synchronous code"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        # Called from inside an event loop: run on a helper thread instead
+        with ThreadPoolExecutor(max_workers=1) as runner:
+            return runner.submit(asyncio.run, coro).result()
     
     def _get_yahoo_data(self, symbol: str) -> Optional[Dict]:
-        """Get data from Yahoo Finance (Free)"""
+        """Get data from Yahoo Finance (Free); None when it has nothing for the symbol"""
+        try:
+            hist = provider_tape.call(
+                'yahoo_finance', f"history:{symbol}:2d",
+                lambda: yf.Ticker(symbol).history(period="2d")
+            )
+        except Exception as e:
+            raise ProviderError(f"Yahoo Finance request failed: {e}") from e
+        
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            hist = ticker.history(period="2d")
-            
             if hist.empty:
                 return None
                 
@@ -64,7 +263,7 @@ class StockDataCollector:
             change = current_price - previous_price
             change_percent = (change / previous_price) * 100 if previous_price != 0 else 0
             
-            return {
+            return self._join_fundamentals({
                 'symbol': symbol,
                 'current_price': float(current_price),
                 'open_price': float(hist['Open'].iloc[-1]),
@@ -73,35 +272,43 @@ class StockDataCollector:
                 'volume': int(hist['Volume'].iloc[-1]),
                 'change': float(change),
                 'change_percent': float(change_percent),
-                'market_cap': info.get('marketCap', 0),
-                'pe_ratio': info.get('trailingPE', 0),
                 'timestamp': datetime.now(),
                 'source': 'yahoo_finance'
-            }
+            })
             
         except Exception as e:
             logger.error(f"Yahoo Finance error for {symbol}: {e}")
             return None
     
+    def _join_fundamentals(self, quote: Dict) -> Dict:
+        """Add market cap and P/E from the in-memory fundamentals store"""
+        fundamentals = self.fundamentals.get(quote['symbol']) or {}
+        quote['market_cap'] = fundamentals.get('market_cap', 0)
+        quote['pe_ratio'] = fundamentals.get('pe_ratio', 0)
+        return quote
+    
     def _get_alpha_vantage_data(self, symbol: str) -> Optional[Dict]:
-        """Get data from Alpha Vantage API"""
-        try:
-            # Rate limiting check
-            if not self._check_rate_limit('alpha_vantage'):
-                return None
-                
-            url = f"{self.config.ALPHA_VANTAGE_BASE_URL}?function=GLOBAL_QUOTE&symbol={symbol}&apikey={self.alpha_vantage_key}"
-            response = requests.get(url, timeout=10)
+        """Get data from Alpha Vantage API; None when it has nothing for the symbol"""
+        # Rate limiting check
+        if not self._check_rate_limit('alpha_vantage'):
+            return None
             
-            if response.status_code != 200:
-                return None
-                
+        url = f"{self.config.ALPHA_VANTAGE_BASE_URL}?function=GLOBAL_QUOTE&symbol={symbol}&apikey={self.alpha_vantage_key}"
+        try:
+            response = provider_tape.http_get('alpha_vantage', get_session(), url, timeout=10)
+        except Exception as e:
+            raise ProviderError(f"Alpha Vantage request failed: {e}") from e
+        
+        if response.status_code != 200:
+            raise ProviderError(f"Alpha Vantage returned HTTP {response.status_code}")
+        
+        try:
             data = response.json()
             
-            if 'Global Quote' not in data:
+            # An unknown symbol comes back as an empty quote
+            quote = data.get('Global Quote')
+            if not quote:
                 return None
-                
-            quote = data['Global Quote']
             
             return {
                 'symbol': symbol,
@@ -122,193 +329,195 @@ class StockDataCollector:
     
     def _get_simulated_data(self, symbol: str) -> Dict:
         """Generate simulated stock data for demo purposes"""
-        # Base prices for different stocks
-        base_prices = {
-            'AAPL': 150.0,
-            'GOOGL': 2800.0,
-            'MSFT': 330.0,
-            'AMZN': 3400.0,
-            'TSLA': 800.0,
-            'META': 320.0,
-            'NVDA': 450.0,
-            'NFLX': 400.0
-        }
-        
-        base_price = base_prices.get(symbol, 100.0)
-        
-        # Add some random variation
-        variation = np.random.normal(0, 0.02)  # 2% standard deviation
-        current_price = base_price * (1 + variation)
-        
-        # Generate other values
-        open_price = current_price * (1 + np.random.normal(0, 0.01))
-        high_price = max(current_price, open_price) * (1 + abs(np.random.normal(0, 0.01)))
-        low_price = min(current_price, open_price) * (1 - abs(np.random.normal(0, 0.01)))
-        volume = int(np.random.normal(1000000, 300000))
-        
-        # Calculate change
-        previous_price = base_price
-        change = current_price - previous_price
-        change_percent = (change / previous_price) * 100
-        
-        return {
-            'symbol': symbol,
-            'current_price': round(current_price, 2),
-            'open_price': round(open_price, 2),
-            'high_price': round(high_price, 2),
-            'low_price': round(low_price, 2),
-            'volume': max(volume, 100000),
-            'change': round(change, 2),
-            'change_percent': round(change_percent, 2),
-            'market_cap': int(current_price * 1000000000),  # Simulated market cap
-            'pe_ratio': round(np.random.normal(25, 5), 2),
-            'timestamp': datetime.now(),
-            'source': 'simulated'
-        }
+        return default_market.quote(symbol)
     
-    def get_historical_data(self, symbol: str, days: int = 30) -> List[Dict]:
-        """Get historical stock data"""
+    def get_historical_data(self, symbol: str, days: int = 30,
+                            columnar: bool = False) -> Union[List[Dict], BarSeries]:
+        """Get historical stock data (a BarSeries when columnar, else a list of dicts)"""
         try:
-            # Try Yahoo Finance first
-            ticker = yf.Ticker(symbol)
-            end_date = datetime.now()
+            end_date = datetime.now().date()
             start_date = end_date - timedelta(days=days)
-            
-            hist = ticker.history(start=start_date, end=end_date)
-            
-            if hist.empty:
-                return self._get_simulated_historical_data(symbol, days)
-            
-            historical_data = []
-            for date, row in hist.iterrows():
-                historical_data.append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': int(row['Volume'])
-                })
-            
+
+            historical_data = self.history_cache.get_bars(
+                symbol, start_date, end_date, self._fetch_yahoo_history, columnar=columnar
+            )
+
+            if not len(historical_data):
+                return self._get_simulated_historical_data(symbol, days, columnar)
+
             return historical_data
             
         except Exception as e:
             logger.error(f"Error getting historical data for {symbol}: {e}")
-            return self._get_simulated_historical_data(symbol, days)
+            return self._get_simulated_historical_data(symbol, days, columnar)
+
+    def _fetch_yahoo_history(self, symbol: str, start_date, end_date) -> pd.DataFrame:
+        """Download daily bars for an inclusive date range from Yahoo Finance"""
+        # Tape key is relative to today so recorded tapes replay on later days
+        today = datetime.now().date()
+        return provider_tape.call(
+            'yahoo_finance', f"history:{symbol}:-{(today - start_date).days}d:-{(today - end_date).days}d",
+            lambda: yf.Ticker(symbol).history(start=start_date, end=end_date + timedelta(days=1))
+        )
     
-    def _get_simulated_historical_data(self, symbol: str, days: int) -> List[Dict]:
+    def _get_simulated_historical_data(self, symbol: str, days: int,
+                                       columnar: bool = False) -> Union[List[Dict], BarSeries]:
         """Generate simulated historical data"""
-        base_prices = {
-            'AAPL': 150.0,
-            'GOOGL': 2800.0,
-            'MSFT': 330.0,
-            'AMZN': 3400.0,
-            'TSLA': 800.0,
-            'META': 320.0,
-            'NVDA': 450.0,
-            'NFLX': 400.0
-        }
-        
-        base_price = base_prices.get(symbol, 100.0)
-        historical_data = []
-        
-        for i in range(days):
-            date = datetime.now() - timedelta(days=days-i)
-            
-            # Create a trend with some randomness
-            trend = 0.001 * i  # Slight upward trend
-            noise = np.random.normal(0, 0.02)
-            
-            close_price = base_price * (1 + trend + noise)
-            open_price = close_price * (1 + np.random.normal(0, 0.01))
-            high_price = max(close_price, open_price) * (1 + abs(np.random.normal(0, 0.01)))
-            low_price = min(close_price, open_price) * (1 - abs(np.random.normal(0, 0.01)))
-            volume = int(np.random.normal(1000000, 300000))
-            
-            historical_data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'open': round(open_price, 2),
-                'high': round(high_price, 2),
-                'low': round(low_price, 2),
-                'close': round(close_price, 2),
-                'volume': max(volume, 100000)
-            })
-        
-        return historical_data
+        series = default_market.history_series(symbol, days, end_date=datetime.now().date() - timedelta(days=1))
+        return series if columnar else series.to_records()
     
-    def get_multiple_stocks_data(self, symbols: List[str]) -> Dict[str, Dict]:
+    def get_multiple_stocks_data(self, symbols: List[str], batched: bool = True) -> Dict[str, Dict]:
         """Get data for multiple stocks"""
         results = {}
-        
         for symbol in symbols:
+            cached = self.quote_cache.get_fresh(symbol)
+            if cached:
+                results[symbol] = cached
+        symbols = [symbol for symbol in symbols if symbol not in results]
+        fetched = {}
+
+        if batched and symbols:
+            # One bulk request per chunk; only symbols missing from the
+            # batch fall through to the per-symbol path below
+            fetched = self._get_yahoo_batch_data(symbols)
+            symbols = [symbol for symbol in symbols if symbol not in fetched]
+
+        if symbols:
+            fetched.update(self._run_sync(self.aget_many(symbols)))
+
+        for symbol, data in fetched.items():
+            self.quote_cache.set(symbol, data)
+        results.update(fetched)
+
+        return results
+
+    def _get_yahoo_batch_data(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get quotes for many symbols with one Yahoo Finance request per chunk"""
+        results = {}
+        batch_size = max(1, self.config.STOCK_BATCH_SIZE)
+
+        for start in range(0, len(symbols), batch_size):
+            chunk = list(dict.fromkeys(symbols[start:start + batch_size]))
             try:
-                data = self.get_current_data(symbol)
-                if data:
-                    results[symbol] = data
-                    
-                # Add small delay to avoid rate limiting
-                time.sleep(0.1)
-                
+                hist = provider_tape.call(
+                    'yahoo_finance', f"download:{','.join(chunk)}:2d",
+                    lambda: yf.download(
+                        tickers=chunk,
+                        period="2d",
+                        group_by='column',
+                        auto_adjust=False,
+                        threads=True,
+                        progress=False
+                    )
+                )
+                results.update(self._quotes_from_batch_history(hist, chunk))
             except Exception as e:
-                logger.error(f"Error getting data for {symbol}: {e}")
-                continue
-        
+                logger.error(f"Yahoo Finance batch error for {len(chunk)} symbols: {e}")
+
         return results
-    
+
+    def _quotes_from_batch_history(self, hist: pd.DataFrame, symbols: List[str]) -> Dict[str, Dict]:
+        """Build per-symbol quote dicts from a bulk (field, symbol) history frame"""
+        quotes = self._batch_snapshot(hist, symbols)
+
+        timestamp = datetime.now()
+        results = {}
+        for symbol, row in zip(quotes.index, quotes.to_dict('records')):
+            results[symbol] = self._join_fundamentals({
+                'symbol': symbol,
+                'current_price': float(row['current_price']),
+                'open_price': float(row['open_price']),
+                'high_price': float(row['high_price']),
+                'low_price': float(row['low_price']),
+                'volume': int(row['volume']),
+                'change': float(row['change']),
+                'change_percent': float(row['change_percent']),
+                'timestamp': timestamp,
+                'source': 'yahoo_finance'
+            })
+
+        return results
+
+    def _batch_snapshot(self, hist: pd.DataFrame, symbols: List[str]) -> pd.DataFrame:
+        """Latest bar and change vs. the previous bar for every symbol of a bulk history frame"""
+        if hist is None or hist.empty:
+            return pd.DataFrame()
+
+        # Single-ticker downloads may come back with flat columns
+        if not isinstance(hist.columns, pd.MultiIndex):
+            hist = pd.concat({symbols[0]: hist}, axis=1).swaplevel(0, 1, axis=1)
+
+        close = hist['Close']
+
+        # Locate each symbol's last and second-to-last valid rows so that
+        # symbols with different trading calendars are handled column-wise
+        valid = close.notna()
+        rank_from_end = valid[::-1].cumsum()[::-1].where(valid)
+        last_row = rank_from_end == 1
+        previous_row = rank_from_end == 2
+
+        def at(frame: pd.DataFrame, mask: pd.DataFrame) -> pd.Series:
+            return frame.where(mask).sum(min_count=1)
+
+        current = at(close, last_row)
+        previous = at(close, previous_row).fillna(current)
+        change = current - previous
+        change_percent = (change / previous.where(previous != 0)).fillna(0) * 100
+
+        return pd.DataFrame({
+            'current_price': current,
+            'open_price': at(hist['Open'], last_row),
+            'high_price': at(hist['High'], last_row),
+            'low_price': at(hist['Low'], last_row),
+            'volume': at(hist['Volume'], last_row).fillna(0),
+            'change': change,
+            'change_percent': change_percent
+        }).dropna(subset=['current_price'])
+
     def _check_rate_limit(self, service: str) -> bool:
-        """Check if we're within rate limits for a service"""
-        current_time = time.time()
-        
-        # Initialize tracking for service
-        if service not in self.last_request_time:
-            self.last_request_time[service] = current_time
-            self.request_count[service] = 0
+        """Wait for a rate-limit token for a service (False if the wait times out)"""
+        if provider_tape.mode == REPLAY:
+            # Replayed responses never reach the provider
             return True
-        
-        # Reset counter if a minute has passed
-        if current_time - self.last_request_time[service] > 60:
-            self.request_count[service] = 0
-            self.last_request_time[service] = current_time
-        
-        # Check if we're under the limit
-        if self.request_count[service] < 5:  # Conservative limit
-            self.request_count[service] += 1
-            return True
-        
-        return False
+        return self.rate_limiter.acquire(service)
     
-    def get_market_overview(self) -> Dict:
-        """Get overall market overview"""
+    def get_market_overview(self, symbols: Optional[List[str]] = None) -> Dict:
+        """Get overall market overview (indices and configured sector ETFs)"""
+        symbols = symbols or self.config.MARKET_OVERVIEW_INDICES + self.config.MARKET_OVERVIEW_SECTORS
         try:
-            # Get major indices
-            indices = ['^GSPC', '^DJI', '^IXIC']  # S&P 500, Dow Jones, NASDAQ
-            market_data = {}
-            
-            for index in indices:
-                try:
-                    ticker = yf.Ticker(index)
-                    hist = ticker.history(period="2d")
-                    
-                    if not hist.empty:
-                        current = hist['Close'].iloc[-1]
-                        previous = hist['Close'].iloc[-2] if len(hist) > 1 else current
-                        change = current - previous
-                        change_percent = (change / previous) * 100 if previous != 0 else 0
-                        
-                        market_data[index] = {
-                            'value': round(current, 2),
-                            'change': round(change, 2),
-                            'change_percent': round(change_percent, 2)
-                        }
-                except Exception as e:
-                    logger.error(f"Error getting data for {index}: {e}")
-            
-            return market_data
-            
+            return self.overview_cache.get_or_fetch(','.join(symbols), self._fetch_market_overview)
         except Exception as e:
             logger.error(f"Error getting market overview: {e}")
             return {}
     
+    def _fetch_market_overview(self, key: str) -> Dict:
+        """Snapshot every overview symbol with one batched Yahoo Finance request"""
+        symbols = key.split(',')
+        hist = provider_tape.call(
+            'yahoo_finance', f"download:{key}:5d",
+            lambda: yf.download(
+                tickers=symbols,
+                period="5d",
+                group_by='column',
+                auto_adjust=False,
+                threads=True,
+                progress=False
+            )
+        )
+        snapshot = self._batch_snapshot(hist, symbols)
+        if snapshot.empty:
+            # Raise so an empty snapshot is never cached
+            raise ValueError(f"no index data returned for {key}")
+        
+        return {
+            symbol: {
+                'value': round(float(row['current_price']), 2),
+                'change': round(float(row['change']), 2),
+                'change_percent': round(float(row['change_percent']), 2)
+            }
+            for symbol, row in zip(snapshot.index, snapshot.to_dict('records'))
+        }
+    
     def test_connection(self) -> Dict[str, bool]:
         """Test connection to all data sources"""
         results = {}
@@ -325,7 +534,7 @@ class StockDataCollector:
         try:
             if self.alpha_vantage_key != 'demo':
                 url = f"{self.config.ALPHA_VANTAGE_BASE_URL}?function=GLOBAL_QUOTE&symbol=AAPL&apikey={self.alpha_vantage_key}"
-                response = requests.get(url, timeout=10)
+                response = get_session().get(url, timeout=10)
                 results['alpha_vantage'] = response.status_code == 200
             else:
                 results['alpha_vantage'] = False
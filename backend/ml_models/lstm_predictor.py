@@ -30,13 +30,21 @@ class LSTMPredictor:
         os.makedirs('models', exist_ok=True)
     
     def prepare_data(self, data, target_column='close'):
-        """Prepare data for LSTM training"""
+        """Prepare data for LSTM training
+
+        ``data`` is a DataFrame, or a mapping of date-ordered column arrays
+        (e.g. ``BarStore.bars(...).arrays()`` plus a sentiment column).
+        """
         try:
-            # Ensure data is sorted by date
-            data = data.sort_index()
-            
-            # Select features
-            feature_data = data[self.features].values
+            if isinstance(data, pd.DataFrame):
+                # Ensure data is sorted by date
+                data = data.sort_index()
+                
+                # Select features
+                feature_data = data[self.features].values
+            else:
+                feature_data = np.column_stack([np.asarray(data[feature], dtype=np.float64)
+                                                for feature in self.features])
             
             # Scale the data
             scaled_data = self.scaler.fit_transform(feature_data)
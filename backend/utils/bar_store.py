@@ -0,0 +1,132 @@
+import threading
+from datetime import date
+import logging
+from typing import Dict, Optional, Union
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+from utils.bars import BarSeries
+
+logger = logging.getLogger(__name__)
+
+# On-disk layout of one bar: 48 little-endian bytes, time in epoch seconds
+BAR_RECORD = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                       ('close', '<f8'), ('volume', '<i8')])
+
+DateLike = Union[str, np.datetime64, None]
+
+class BarStore:
+    """Append-only, memory-mapped OHLCV files, one per symbol
+
+    Each ``<root>/<SYMBOL>.bars`` file is a flat array of ``BAR_RECORD``s in
+    time order. Reads map the file read-only and return ``BarSeries`` whose
+    arrays are views into the mapping, so slicing a date range copies
+    nothing and every process reading the same symbol shares its pages
+    through the OS page cache. Only one process should append to a symbol
+    at a time; readers pick up appended bars on their next read.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.abspath(root or Config.BAR_STORE_PATH)
+        os.makedirs(self.root, exist_ok=True)
+        self._maps = {}  # symbol -> read-only memmap of its records
+        self._lock = threading.Lock()
+
+    def path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol}.bars")
+
+    def append(self, series: BarSeries) -> int:
+        """Append bars newer than the last stored bar; returns how many were written"""
+        if not len(series):
+            return 0
+
+        times = series.dates.astype('datetime64[s]').view(np.int64)
+        last = self.last_time(series.symbol)
+        keep = np.ones(len(times), dtype=bool) if last is None else times > last
+        if not keep.any():
+            return 0
+
+        records = np.empty(int(keep.sum()), dtype=BAR_RECORD)
+        records['time'] = times[keep]
+        for field in ('open', 'high', 'low', 'close', 'volume'):
+            records[field] = getattr(series, field)[keep]
+        if np.any(np.diff(records['time']) <= 0):
+            raise ValueError(f"Bars for {series.symbol} must be in strictly increasing time order")
+
+        # Whole records in a single O_APPEND write, so readers never see half a bar
+        fd = os.open(self.path(series.symbol), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size % BAR_RECORD.itemsize:
+                # Drop the partial record an interrupted append left behind
+                os.ftruncate(fd, size - size % BAR_RECORD.itemsize)
+            os.write(fd, records.tobytes())
+        finally:
+            os.close(fd)
+        return len(records)
+
+    def last_time(self, symbol: str) -> Optional[int]:
+        records = self._records(symbol)
+        return int(records['time'][-1]) if len(records) else None
+
+    def bars(self, symbol: str, start: DateLike = None, end: DateLike = None) -> BarSeries:
+        """Zero-copy bars with ``start <= date < end`` (either bound optional)"""
+        records = self._records(symbol)
+        times = records['time']
+        lo = 0 if start is None else int(np.searchsorted(times, _epoch(start), side='left'))
+        hi = len(times) if end is None else int(np.searchsorted(times, _epoch(end), side='left'))
+        window = records[lo:hi]
+        return BarSeries(
+            symbol,
+            window['time'].view('datetime64[s]'),
+            window['open'], window['high'], window['low'], window['close'],
+            window['volume']
+        )
+
+    def sync_daily(self, symbol: str, db_manager, start_date: str, end_date: str) -> int:
+        """Append cached daily bars from ``db_manager`` that are newer than the store
+
+        Only settled days (before today) are synced: the store is append-only,
+        so today's partial bar could never be corrected once written.
+        """
+        end_date = min(end_date, str(np.datetime64(date.today(), 'D') - 1))
+        last = self.last_time(symbol)
+        if last is not None:
+            start_date = max(start_date, str(np.datetime64(last, 's').astype('datetime64[D]') + 1))
+        if start_date > end_date:
+            return 0
+        return self.append(db_manager.fetch_daily_bars(symbol, start_date, end_date))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'root': self.root,
+                'mapped_symbols': len(self._maps),
+                'mapped_bytes': sum(records.nbytes for records in self._maps.values())
+            }
+
+    def _records(self, symbol: str) -> np.ndarray:
+        """Read-only mapping of a symbol's file, remapped when the file has grown"""
+        path = self.path(symbol)
+        try:
+            count = os.path.getsize(path) // BAR_RECORD.itemsize
+        except FileNotFoundError:
+            return np.empty(0, dtype=BAR_RECORD)
+
+        with self._lock:
+            records = self._maps.get(symbol)
+            if records is None or len(records) != count:
+                if count == 0:
+                    return np.empty(0, dtype=BAR_RECORD)
+                # A trailing partial record (interrupted append) is left unmapped
+                records = np.memmap(path, dtype=BAR_RECORD, mode='r', shape=(count,))
+                self._maps[symbol] = records
+            return records
+
+def _epoch(value: DateLike) -> int:
+    return int(np.datetime64(value, 's').astype(np.int64))
@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# One database row as parsed by BarSeries.from_cursor
+_ROW_DTYPE = np.dtype([('timestamp', 'datetime64[us]'), ('open', np.float64), ('high', np.float64),
+                       ('low', np.float64), ('close', np.float64), ('volume', np.int64)])
+
+@dataclass
+class BarSeries:
+    """Struct-of-arrays OHLCV bars for one symbol
+
+    ``dates`` is datetime64 (``[D]`` for daily bars, ``[s]`` for intraday),
+    prices are float64 and ``volume`` is int64, all of equal length. Convert
+    to the legacy list-of-dicts shape with ``to_records`` only at the JSON
+    edge.
+    """
+    symbol: str
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @classmethod
+    def empty(cls, symbol: str, unit: str = 'D') -> 'BarSeries':
+        prices = np.empty(0, dtype=np.float64)
+        return cls(symbol, np.empty(0, dtype=f'datetime64[{unit}]'),
+                   prices, prices.copy(), prices.copy(), prices.copy(), np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def from_rows(cls, symbol: str, rows: Sequence[Tuple], unit: str = 'D') -> 'BarSeries':
+        """Build from (date, open, high, low, close, volume) rows, e.g. a DB cursor"""
+        if not rows:
+            return cls.empty(symbol, unit)
+
+        dates, opens, highs, lows, closes, volumes = zip(*rows)
+        return cls(
+            symbol,
+            pd.to_datetime(list(dates), format='ISO8601').values.astype(f'datetime64[{unit}]'),
+            np.asarray(opens, dtype=np.float64),
+            np.asarray(highs, dtype=np.float64),
+            np.asarray(lows, dtype=np.float64),
+            np.asarray(closes, dtype=np.float64),
+            np.asarray(volumes, dtype=np.float64).astype(np.int64)
+        )
+
+    @classmethod
+    def from_cursor(cls, symbol: str, cursor, count: int, unit: str = 's',
+                    chunk_size: int = 65536) -> 'BarSeries':
+        """Stream (ISO timestamp, open, high, low, close, volume) rows into preallocated arrays
+
+        ``count`` is the number of rows the cursor will yield. Rows are
+        fetched ``chunk_size`` at a time and converted by NumPy in one pass
+        per chunk (timestamps straight to int64 epoch), so no list of all
+        rows or DataFrame is ever built. NULL prices become NaN.
+        """
+        epoch = np.empty(count, dtype=np.int64)
+        prices = np.empty((4, count), dtype=np.float64)  # open/high/low/close rows
+        volume = np.empty(count, dtype=np.int64)
+
+        filled = 0
+        while filled < count:
+            rows = cursor.fetchmany(min(chunk_size, count - filled))
+            if not rows:
+                break
+            block = np.array(rows, dtype=_ROW_DTYPE)
+            end = filled + len(block)
+            epoch[filled:end] = block['timestamp'].view(np.int64) // 1_000_000
+            for row, field in enumerate(BAR_FIELDS[:4]):
+                prices[row, filled:end] = block[field]
+            volume[filled:end] = block['volume']
+            filled = end
+
+        dates = epoch[:filled].view('datetime64[s]')
+        return cls(
+            symbol,
+            dates if unit == 's' else dates.astype(f'datetime64[{unit}]'),
+            prices[0, :filled], prices[1, :filled], prices[2, :filled], prices[3, :filled],
+            volume[:filled]
+        )
+
+    @classmethod
+    def concat(cls, symbol: str, parts: Sequence['BarSeries']) -> 'BarSeries':
+        return cls(symbol, *(np.concatenate([getattr(part, field) for part in parts])
+                             for field in ('dates',) + BAR_FIELDS))
+
+    @classmethod
+    def from_history(cls, symbol: str, hist: pd.DataFrame, unit: str = 'D') -> 'BarSeries':
+        """Build from a Yahoo-style Open/High/Low/Close/Volume frame"""
+        if hist is None or hist.empty:
+            return cls.empty(symbol, unit)
+
+        index = hist.index.tz_localize(None) if getattr(hist.index, 'tz', None) is not None else hist.index
+        return cls(
+            symbol,
+            index.values.astype(f'datetime64[{unit}]'),
+            hist['Open'].to_numpy(dtype=np.float64),
+            hist['High'].to_numpy(dtype=np.float64),
+            hist['Low'].to_numpy(dtype=np.float64),
+            hist['Close'].to_numpy(dtype=np.float64),
+            hist['Volume'].to_numpy(dtype=np.float64).astype(np.int64)
+        )
+
+    def round(self, decimals: int = 2) -> 'BarSeries':
+        return BarSeries(
+            self.symbol, self.dates,
+            np.round(self.open, decimals), np.round(self.high, decimals),
+            np.round(self.low, decimals), np.round(self.close, decimals),
+            self.volume
+        )
+
+    def date_strings(self) -> List[str]:
+        return np.datetime_as_string(self.dates).tolist()
+
+    def to_records(self) -> List[Dict]:
+        """Legacy list of {date, open, high, low, close, volume} dicts"""
+        return [
+            {
+                'date': bar_date,
+                'open': open_price,
+                'high': high_price,
+                'low': low_price,
+                'close': close_price,
+                'volume': volume
+            }
+            for bar_date, open_price, high_price, low_price, close_price, volume in zip(
+                self.date_strings(),
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                self.volume.tolist()
+            )
+        ]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """The columns keyed by name ('date' plus BAR_FIELDS), without copying"""
+        columns = {'date': self.dates}
+        for field in BAR_FIELDS:
+            columns[field] = getattr(self, field)
+        return columns
+
+    def to_columnar(self) -> Dict[str, List]:
+        """JSON-ready dict of parallel column lists"""
+        columns = {'date': self.date_strings()}
+        for field in BAR_FIELDS:
+            columns[field] = getattr(self, field).tolist()
+        return columns
@@ -10,6 +10,36 @@ class Config:
     # Database Configuration
     DATABASE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'database', 'stock_market.db')
     
+    # SQLite connection pool and pragmas
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 8))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))  # seconds to wait for a free connection
+    DB_JOURNAL_MODE = os.getenv('DB_JOURNAL_MODE', 'WAL')
+    DB_SYNCHRONOUS = os.getenv('DB_SYNCHRONOUS', 'NORMAL')
+    DB_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', 65536))
+    DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', 268435456))
+    DB_TEMP_STORE = os.getenv('DB_TEMP_STORE', 'MEMORY')
+    DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', 30000))
+    DB_AUTO_VACUUM = os.getenv('DB_AUTO_VACUUM', 'INCREMENTAL')
+    
+    # Parquet archive tier for rows aged out of the hot database
+    ARCHIVE_ENABLED = os.getenv('ARCHIVE_ENABLED', 'true').lower() == 'true'
+    ARCHIVE_PATH = os.getenv('ARCHIVE_PATH', os.path.join(os.path.dirname(DATABASE_PATH), 'archive'))
+    ARCHIVE_COMPRESSION = os.getenv('ARCHIVE_COMPRESSION', 'zstd')
+    
+    # Memory-mapped per-symbol bar files for model training and backtests
+    BAR_STORE_PATH = os.getenv('BAR_STORE_PATH', os.path.join(os.path.dirname(DATABASE_PATH), 'bars'))
+    
+    # Retention and maintenance (cleanup, incremental vacuum, optimize)
+    RETENTION_DAYS = int(os.getenv('RETENTION_DAYS', 90))
+    RETENTION_BATCH_SIZE = int(os.getenv('RETENTION_BATCH_SIZE', 5000))  # rows per delete transaction
+    RETENTION_BATCH_PAUSE = float(os.getenv('RETENTION_BATCH_PAUSE', 0.05))  # seconds between batches
+    MAINTENANCE_INTERVAL = int(os.getenv('MAINTENANCE_INTERVAL', 86400))  # 0 disables the daemon job
+    INCREMENTAL_VACUUM_PAGES = int(os.getenv('INCREMENTAL_VACUUM_PAGES', 2000))
+    
+    # Read-result cache invalidated by per-table/per-symbol write versions
+    QUERY_CACHE_ENABLED = os.getenv('QUERY_CACHE_ENABLED', 'true').lower() == 'true'
+    QUERY_CACHE_MAX_BYTES = int(os.getenv('QUERY_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    
     # API Keys (You'll need to get these from respective providers)
     ALPHA_VANTAGE_API_KEY = os.getenv('ALPHA_VANTAGE_API_KEY')
     NEWS_API_KEY = os.getenv('NEWS_API_KEY')
@@ -28,10 +58,70 @@ class Config:
     STOCK_DATA_UPDATE_INTERVAL = int(os.getenv('STOCK_UPDATE_INTERVAL', 60))
     NEWS_UPDATE_INTERVAL = int(os.getenv('NEWS_UPDATE_INTERVAL', 300))
     SENTIMENT_UPDATE_INTERVAL = int(os.getenv('SENTIMENT_UPDATE_INTERVAL', 180))
+    FUNDAMENTALS_UPDATE_INTERVAL = int(os.getenv('FUNDAMENTALS_UPDATE_INTERVAL', 86400))
+    FUNDAMENTALS_RETRY_BACKOFF = int(os.getenv('FUNDAMENTALS_RETRY_BACKOFF', 60))  # doubles per failed fetch
+    
+    # Background ingestion daemon (refreshes quotes/news/sentiment on the intervals above)
+    INGESTION_DAEMON_ENABLED = os.getenv('INGESTION_DAEMON_ENABLED', 'false').lower() == 'true'
+    LATEST_VALUE_MAX_AGE_FACTOR = float(os.getenv('LATEST_VALUE_MAX_AGE_FACTOR', 3))  # x update interval
+    
+    # Intraday bars aggregated from quote ticks
+    INTRADAY_INTERVALS = [s for s in os.getenv('INTRADAY_INTERVALS', '1m,5m,1h').split(',') if s]
+    INTRADAY_BAR_CAPACITY = int(os.getenv('INTRADAY_BAR_CAPACITY', 500))  # closed bars kept per symbol/interval
+    INTRADAY_FLUSH_SIZE = int(os.getenv('INTRADAY_FLUSH_SIZE', 1000))  # closed bars per DB batch
+    
+    # Write-behind queue for ingestion inserts
+    WRITE_BEHIND_ENABLED = os.getenv('WRITE_BEHIND_ENABLED', 'false').lower() == 'true'
+    WRITE_BEHIND_BATCH_SIZE = int(os.getenv('WRITE_BEHIND_BATCH_SIZE', 500))
+    WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv('WRITE_BEHIND_FLUSH_INTERVAL', 2.0))  # seconds
+    WRITE_BEHIND_MAX_PENDING = int(os.getenv('WRITE_BEHIND_MAX_PENDING', 50000))  # rows before producers block
+    
+    # Market overview: indices plus optional sector ETFs, fetched in one batch
+    MARKET_OVERVIEW_INDICES = [s for s in os.getenv('MARKET_OVERVIEW_INDICES', '^GSPC,^DJI,^IXIC').split(',') if s]
+    MARKET_OVERVIEW_SECTORS = [s for s in os.getenv('MARKET_OVERVIEW_SECTORS', '').split(',') if s]  # e.g. XLK,XLF,XLE
+    MARKET_OVERVIEW_TTL = float(os.getenv('MARKET_OVERVIEW_TTL', 60))
+    
+    # Batched quote fetching (symbols per bulk provider request)
+    STOCK_BATCH_SIZE = int(os.getenv('STOCK_BATCH_SIZE', 100))
+    
+    # Async provider fan-out
+    STOCK_FETCH_CONCURRENCY = int(os.getenv('STOCK_FETCH_CONCURRENCY', 64))
+    STOCK_FETCH_TIMEOUT = float(os.getenv('STOCK_FETCH_TIMEOUT', 10))  # per provider call, seconds
+    PROVIDER_CONCURRENCY = {
+        'yahoo_finance': int(os.getenv('YAHOO_CONCURRENCY', 32)),
+        'alpha_vantage': int(os.getenv('ALPHA_VANTAGE_CONCURRENCY', 2))
+    }
+    
+    # Provider routing and circuit breakers
+    PROVIDER_HEALTH_WINDOW = int(os.getenv('PROVIDER_HEALTH_WINDOW', 50))  # calls kept per provider
+    PROVIDER_HEALTH_HORIZON = float(os.getenv('PROVIDER_HEALTH_HORIZON', 300))  # seconds a sample counts
+    PROVIDER_MIN_SAMPLES = int(os.getenv('PROVIDER_MIN_SAMPLES', 5))  # before error rate can demote
+    PROVIDER_MAX_ERROR_RATE = float(os.getenv('PROVIDER_MAX_ERROR_RATE', 0.5))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+    CIRCUIT_COOLDOWN = float(os.getenv('CIRCUIT_COOLDOWN', 30))  # seconds
+    HEDGE_ENABLED = os.getenv('HEDGE_ENABLED', 'false').lower() == 'true'
+    HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', 95))
+    HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', 20))
+    
+    # Pooled HTTP sessions
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 10))  # hosts kept / per-host async limit
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 32))  # connections per host / total async limit
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', 0.5))
+    HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', 30))
+    HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 10))
+    
+    # Quote cache
+    QUOTE_CACHE_TTL = float(os.getenv('QUOTE_CACHE_TTL', STOCK_DATA_UPDATE_INTERVAL))
+    QUOTE_CACHE_MAX_SIZE = int(os.getenv('QUOTE_CACHE_MAX_SIZE', 2000))
+    SIMULATED_QUOTE_TTL = float(os.getenv('SIMULATED_QUOTE_TTL', 5))  # fallback quotes retry providers soon
     
     # Default Stock Symbols
     DEFAULT_STOCKS = os.getenv('DEFAULT_STOCKS', 'AAPL,GOOGL,MSFT,AMZN,TSLA,META,NVDA,NFLX').split(',')
     
+    # Synthetic market engine (unset = fresh randomness on every call)
+    SYNTHETIC_MARKET_SEED = int(os.getenv('SYNTHETIC_MARKET_SEED')) if os.getenv('SYNTHETIC_MARKET_SEED') else None
+    
     # Model Configuration
     MODEL_RETRAIN_INTERVAL = 21600  # 6 hours in seconds
     PREDICTION_HORIZON = 24  # hours
@@ -44,6 +134,32 @@ class Config:
     # Rate Limiting
     MAX_REQUESTS_PER_MINUTE = 60
     
+    # Provider token buckets: provider -> (requests, per seconds)
+    RATE_LIMITS = {
+        'alpha_vantage': (
+            int(os.getenv('ALPHA_VANTAGE_RATE_LIMIT', 5)),
+            float(os.getenv('ALPHA_VANTAGE_RATE_PERIOD', 60))
+        ),
+        'news_api': (
+            int(os.getenv('NEWS_API_RATE_LIMIT', 100)),
+            float(os.getenv('NEWS_API_RATE_PERIOD', 86400))
+        )
+    }
+    RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', 5))  # seconds queued before giving up
+    NEWS_API_DAEMON_SHARE = float(os.getenv('NEWS_API_DAEMON_SHARE', 0.5))  # of the news_api budget; rest serves requests
+    RATE_LIMIT_DB_PATH = os.getenv(
+        'RATE_LIMIT_DB_PATH',
+        os.path.join(os.path.dirname(DATABASE_PATH), 'rate_limits.db')
+    )
+    
+    # Provider record/replay tape (off | record | replay) for offline benchmarks
+    PROVIDER_TAPE_MODE = os.getenv('PROVIDER_TAPE_MODE', 'off')
+    PROVIDER_TAPE_PATH = os.getenv(
+        'PROVIDER_TAPE_PATH',
+        os.path.join(os.path.dirname(DATABASE_PATH), 'provider_tape.jsonl.gz')
+    )
+    PROVIDER_TAPE_SPEED = float(os.getenv('PROVIDER_TAPE_SPEED', 1.0))  # replay speed-up; 0 = no delay
+    
     @staticmethod
     def get_api_key(service):
         """Get API key for a specific service"""
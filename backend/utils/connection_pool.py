@@ -0,0 +1,125 @@
+import sqlite3
+import threading
+import queue
+import logging
+from contextlib import contextmanager
+from typing import Dict, Optional
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+class ConnectionPool:
+    """Bounded pool of tuned SQLite connections for one database file
+
+    Connections are opened lazily up to ``size`` and reused across threads.
+    The database runs in WAL mode so readers never block on the ingestion
+    writer; writers wait on ``busy_timeout`` instead of failing with
+    "database is locked". Checking out a connection works like
+    ``with sqlite3.connect(...) as conn``: the transaction is committed on
+    success and rolled back on error, then the connection goes back to the
+    pool.
+    """
+
+    def __init__(self, db_path: str, size: Optional[int] = None, timeout: Optional[float] = None):
+        self.db_path = db_path
+        self.size = size or Config.DB_POOL_SIZE
+        self.timeout = timeout or Config.DB_POOL_TIMEOUT
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._pid = os.getpid()
+        self._counters = {'checkouts': 0, 'waits': 0, 'opened': 0}
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._counters, size=self.size, open=self._opened, idle=self._idle.qsize())
+
+    def close_all(self):
+        """Close idle connections (checked-out ones close when returned)"""
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._opened = 0
+
+    def dedicated(self) -> sqlite3.Connection:
+        """A tuned connection outside the pool, owned (and closed) by the caller"""
+        return self._connect()
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections must not be shared with a forked parent
+                self._reset()
+            self._counters['checkouts'] += 1
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            if self._opened < self.size:
+                self._opened += 1
+                self._counters['opened'] += 1
+                open_new = True
+            else:
+                self._counters['waits'] += 1
+                open_new = False
+
+        if open_new:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection available within {self.timeout}s ({self.size} in use)")
+
+    def _release(self, conn: sqlite3.Connection):
+        with self._lock:
+            if self._pid != os.getpid() or self._opened == 0:
+                conn.close()
+                return
+        self._idle.put(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=Config.DB_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(Config.DB_BUSY_TIMEOUT_MS)}")
+        # Only takes effect while the file is still empty, so it must precede journal_mode
+        conn.execute(f"PRAGMA auto_vacuum = {Config.DB_AUTO_VACUUM}")
+        conn.execute(f"PRAGMA journal_mode = {Config.DB_JOURNAL_MODE}")
+        conn.execute(f"PRAGMA synchronous = {Config.DB_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA cache_size = {-int(Config.DB_CACHE_SIZE_KB)}")
+        conn.execute(f"PRAGMA mmap_size = {int(Config.DB_MMAP_SIZE)}")
+        conn.execute(f"PRAGMA temp_store = {Config.DB_TEMP_STORE}")
+        return conn
@@ -1,13 +1,57 @@
 import sqlite3
 import os
-from datetime import datetime
+import time
+import hashlib
+import re
+import logging
+from datetime import datetime, timedelta
 import json
+import numpy as np
 import pandas as pd
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.bars import BarSeries
+from utils.connection_pool import ConnectionPool
+from utils.parquet_archive import ParquetArchive
+from utils.query_cache import VersionedQueryCache, cached_query
+from utils.synthetic_market import is_simulated
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Tables trimmed by cleanup_old_data
+RETENTION_TABLES = ('stock_data', 'sentiment_data', 'predictions')
+
+# Natural keys enforced with unique indexes: table -> (index name, columns)
+UNIQUE_KEYS = {
+    'stock_data': ('uq_stock_symbol_timestamp', ('symbol', 'timestamp')),
+    'sentiment_data': ('uq_sentiment_symbol_source_timestamp', ('symbol', 'source', 'timestamp')),
+    'news_articles': ('uq_news_symbol_hash', ('symbol', 'content_hash'))
+}
+
+# Rows that are the same row when archived twice: the natural key, or the
+# row id for tables without one
+ARCHIVE_KEYS = {
+    'stock_data': UNIQUE_KEYS['stock_data'][1],
+    'sentiment_data': UNIQUE_KEYS['sentiment_data'][1],
+    'predictions': ('id',)
+}
+
+# Rollup resolutions, finest first: bucket label format and bucket width
+ROLLUP_RESOLUTIONS = {
+    '1h': ('%Y-%m-%d %H:00:00', timedelta(hours=1)),
+    '1d': ('%Y-%m-%d 00:00:00', timedelta(days=1))
+}
 
 class DatabaseManager:
     def __init__(self, db_path='../database/stock_market.db'):
         self.db_path = os.path.abspath(db_path)
         self.ensure_directory_exists()
+        self.pool = ConnectionPool(self.db_path)
+        self.archive = ParquetArchive()
+        self.query_cache = VersionedQueryCache(connect=self.pool.dedicated) if Config.QUERY_CACHE_ENABLED else None
     
     def ensure_directory_exists(self):
         """Ensure database directory exists"""
@@ -16,8 +60,17 @@ class DatabaseManager:
             os.makedirs(directory)
     
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Check out a pooled connection (use as ``with self.get_connection() as conn``)"""
+        return self.pool.connection()
+    
+    def invalidate(self, table, symbols=None):
+        """Expire cached reads of a table (only the given symbols when provided)
+
+        Called by the write paths after they commit; code that writes to the
+        database directly should call it too.
+        """
+        if self.query_cache is not None:
+            self.query_cache.bump(table, symbols)
     
     def initialize_database(self):
         """Initialize all database tables"""
@@ -85,9 +138,32 @@ class DatabaseManager:
                     total_value REAL,
                     profit_loss REAL,
                     profit_loss_percent REAL,
-                    last_updated DATETIME DEFAULT CURRENT_TIMESTAMP
+                    last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    portfolio_id TEXT NOT NULL DEFAULT 'default'
+                )
+            ''')
+            self._add_column(cursor, 'portfolio', 'portfolio_id', "TEXT NOT NULL DEFAULT 'default'")
+            
+            # Most recent price per symbol, kept current by the ingestion writers
+            has_latest_prices = cursor.execute('''
+                SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'latest_prices'
+            ''').fetchone()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS latest_prices (
+                    symbol TEXT PRIMARY KEY,
+                    price REAL NOT NULL,
+                    timestamp DATETIME NOT NULL
                 )
             ''')
+            if not has_latest_prices:
+                # SQLite returns the close of the MAX(timestamp) row for each symbol
+                cursor.execute('''
+                    INSERT INTO latest_prices (symbol, price, timestamp)
+                    SELECT symbol, close_price, MAX(timestamp)
+                    FROM stock_data
+                    WHERE close_price IS NOT NULL
+                    GROUP BY symbol
+                ''')
             
             # News articles table
             cursor.execute('''
@@ -100,6 +176,7 @@ class DatabaseManager:
                     published_date DATETIME,
                     content TEXT,
                     sentiment_score REAL,
+                    content_hash TEXT,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
@@ -120,74 +197,473 @@ class DatabaseManager:
                 )
             ''')
             
+            # Fundamentals table (slow-moving per-symbol values)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS fundamentals (
+                    symbol TEXT PRIMARY KEY,
+                    market_cap REAL,
+                    pe_ratio REAL,
+                    updated_at DATETIME NOT NULL
+                )
+            ''')
+            
+            # Daily OHLCV bar cache for historical charts and training
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS daily_bars (
+                    symbol TEXT NOT NULL,
+                    date DATE NOT NULL,
+                    open_price REAL,
+                    high_price REAL,
+                    low_price REAL,
+                    close_price REAL,
+                    volume INTEGER,
+                    PRIMARY KEY (symbol, date)
+                )
+            ''')
+            
+            # Date range already downloaded into daily_bars, per symbol
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS history_coverage (
+                    symbol TEXT PRIMARY KEY,
+                    start_date DATE NOT NULL,
+                    end_date DATE NOT NULL,
+                    updated_at DATETIME NOT NULL
+                )
+            ''')
+            
+            # OHLCV rollups of stock_data, cascaded raw -> 1h -> 1d
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS stock_rollups (
+                    symbol TEXT NOT NULL,
+                    resolution TEXT NOT NULL,
+                    bucket DATETIME NOT NULL,
+                    open_price REAL,
+                    high_price REAL,
+                    low_price REAL,
+                    close_price REAL,
+                    volume INTEGER,
+                    samples INTEGER NOT NULL,
+                    PRIMARY KEY (symbol, resolution, bucket)
+                )
+            ''')
+            
+            # Averaged sentiment rollups of sentiment_data, raw -> 1h -> 1d
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sentiment_rollups (
+                    symbol TEXT NOT NULL,
+                    resolution TEXT NOT NULL,
+                    bucket DATETIME NOT NULL,
+                    sentiment_score REAL,
+                    compound_score REAL,
+                    positive_score REAL,
+                    negative_score REAL,
+                    neutral_score REAL,
+                    samples INTEGER NOT NULL,
+                    PRIMARY KEY (symbol, resolution, bucket)
+                )
+            ''')
+            
+            self._ensure_unique_keys(cursor)
+            
             # Create indexes for better performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_stock_symbol_timestamp ON stock_data(symbol, timestamp)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_sentiment_symbol_timestamp ON sentiment_data(symbol, timestamp)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_predictions_symbol_timestamp ON predictions(symbol, timestamp)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_portfolio_symbol ON portfolio(symbol)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_portfolio_id_symbol ON portfolio(portfolio_id, symbol)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_symbol_published ON news_articles(symbol, published_date)')
+            
+            self._ensure_news_search(cursor)
             
             conn.commit()
+        
+        # Versions are recorded on their own connection, so only after the commit
+        for table in UNIQUE_KEYS:
+            self.invalidate(table)
+    
+    def _ensure_unique_keys(self, cursor):
+        """Create the UNIQUE_KEYS indexes, first removing duplicates of older databases
+
+        Duplicates keep their most recently inserted row. Runs only while an
+        index is missing, so it is a no-op on every later start.
+        """
+        self._add_column(cursor, 'news_articles', 'content_hash', 'TEXT')
+        
+        missing = cursor.execute('''
+            SELECT COUNT(*) FROM news_articles WHERE content_hash IS NULL
+        ''').fetchone()[0]
+        if missing:
+            cursor.executemany('UPDATE news_articles SET content_hash = ? WHERE id = ?', [
+                (self._news_hash({'url': url, 'title': title, 'source': source, 'published_date': published}), row_id)
+                for row_id, url, title, source, published in cursor.execute('''
+                    SELECT id, url, title, source, published_date FROM news_articles WHERE content_hash IS NULL
+                ''').fetchall()
+            ])
+        
+        existing = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        for table, (index, key) in UNIQUE_KEYS.items():
+            if index in existing:
+                continue
+            cursor.execute(f'''
+                DELETE FROM {table}
+                WHERE rowid NOT IN (SELECT MAX(rowid) FROM {table} GROUP BY {', '.join(key)})
+            ''')
+            if cursor.rowcount:
+                logger.info(f"Removed {cursor.rowcount} duplicate {table} rows")
+                rollups = {'stock_data': self._update_stock_rollups,
+                           'sentiment_data': self._update_sentiment_rollups}.get(table)
+                if rollups:
+                    rollups(cursor, [
+                        {'symbol': symbol, 'timestamp': timestamp}
+                        for symbol, timestamp in cursor.execute(
+                            f'SELECT DISTINCT symbol, timestamp FROM {table}'
+                        ).fetchall()
+                    ])
+            cursor.execute(f"CREATE UNIQUE INDEX {index} ON {table}({', '.join(key)})")
+        
+        # The unique (symbol, timestamp) index replaces the plain one
+        cursor.execute('DROP INDEX IF EXISTS idx_stock_symbol_timestamp')
+    
+    def _ensure_news_search(self, cursor):
+        """FTS5 index over news titles and content, kept in sync with news_articles by triggers"""
+        exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'news_fts'").fetchone()
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+                    title, content,
+                    content='news_articles', content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 is unavailable, news search is disabled: {e}")
+            return
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news_articles BEGIN
+                INSERT INTO news_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news_articles BEGIN
+                INSERT INTO news_fts (news_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS news_fts_update AFTER UPDATE OF title, content ON news_articles BEGIN
+                INSERT INTO news_fts (news_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO news_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+            END
+        ''')
+        if not exists:
+            # Index the articles stored before search existed
+            cursor.execute("INSERT INTO news_fts (news_fts) VALUES ('rebuild')")
+    
+    @staticmethod
+    def _add_column(cursor, table, column, definition):
+        """Add a column that databases created by older versions lack"""
+        columns = [row[1] for row in cursor.execute(f'PRAGMA table_info({table})')]
+        if column not in columns:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+    
+    @staticmethod
+    def _news_hash(article):
+        """Identity of a news article: its URL, or its title/source/date when it has none"""
+        url = (article.get('url') or '').strip()
+        if url:
+            identity = url.lower()
+        else:
+            identity = '|'.join(str(article.get(field) or '').strip().lower()
+                                for field in ('title', 'source', 'published_date'))
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
     
     def insert_stock_data(self, symbol, data):
         """Insert stock data into database"""
+        self.insert_stock_data_many([dict(data, symbol=symbol)])
+    
+    def insert_stock_data_many(self, rows):
+        """Upsert many stock_data rows (dicts with a 'symbol' key) in one transaction
+
+        A row for an existing (symbol, timestamp) replaces its values, so
+        re-polling the same bar does not add rows. The 1h/1d rollups of every
+        bucket touched by the rows are refreshed in the same transaction.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
+            cursor.executemany('''
                 INSERT INTO stock_data (symbol, timestamp, open_price, close_price, 
                                       high_price, low_price, volume, change_percent)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                symbol,
-                data['timestamp'],
-                data['open_price'],
-                data['close_price'],
-                data['high_price'],
-                data['low_price'],
-                data['volume'],
-                data['change_percent']
-            ))
+                ON CONFLICT(symbol, timestamp) DO UPDATE SET
+                    open_price = excluded.open_price,
+                    close_price = excluded.close_price,
+                    high_price = excluded.high_price,
+                    low_price = excluded.low_price,
+                    volume = excluded.volume,
+                    change_percent = excluded.change_percent
+            ''', [
+                (
+                    row['symbol'],
+                    self._to_datetime(row['timestamp']),
+                    row['open_price'],
+                    row['close_price'],
+                    row['high_price'],
+                    row['low_price'],
+                    row['volume'],
+                    row['change_percent']
+                )
+                for row in rows
+            ])
+            self._update_stock_rollups(cursor, rows)
+            self._upsert_latest_prices(cursor, [
+                {'symbol': row['symbol'], 'price': row['close_price'], 'timestamp': row['timestamp']}
+                for row in rows
+            ])
+            conn.commit()
+        self.invalidate('stock_data', [row['symbol'] for row in rows])
+    
+    def upsert_latest_prices(self, prices):
+        """Record live prices (dicts of symbol, price, timestamp) in latest_prices"""
+        with self.get_connection() as conn:
+            self._upsert_latest_prices(conn.cursor(), prices)
             conn.commit()
     
+    def _upsert_latest_prices(self, cursor, prices):
+        """Keep the newest price per symbol; older, price-less or simulated rows never overwrite it"""
+        newest = {}
+        for row in prices:
+            if row['price'] is None or is_simulated(row):
+                continue
+            timestamp = self._to_datetime(row['timestamp'])
+            if row['symbol'] not in newest or timestamp >= newest[row['symbol']][1]:
+                newest[row['symbol']] = (row['price'], timestamp)
+        
+        cursor.executemany('''
+            INSERT INTO latest_prices (symbol, price, timestamp)
+            VALUES (?, ?, ?)
+            ON CONFLICT(symbol) DO UPDATE SET
+                price = excluded.price,
+                timestamp = excluded.timestamp
+            WHERE excluded.timestamp >= latest_prices.timestamp
+        ''', [(symbol, price, timestamp) for symbol, (price, timestamp) in newest.items()])
+    
     def insert_sentiment_data(self, symbol, sentiment_data):
         """Insert sentiment data into database"""
+        self.insert_sentiment_data_many([dict(sentiment_data, symbol=symbol)])
+    
+    def insert_sentiment_data_many(self, rows):
+        """Upsert many sentiment_data rows (dicts with a 'symbol' key) in one transaction
+
+        Rows are keyed by (symbol, source, timestamp). The 1h/1d sentiment
+        rollups of every touched bucket are refreshed too.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
+            cursor.executemany('''
                 INSERT INTO sentiment_data (symbol, timestamp, source, content, 
                                           sentiment_score, sentiment_label, compound_score,
                                           positive_score, negative_score, neutral_score)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                symbol,
-                sentiment_data['timestamp'],
-                sentiment_data['source'],
-                sentiment_data['content'],
-                sentiment_data['sentiment_score'],
-                sentiment_data['sentiment_label'],
-                sentiment_data['compound_score'],
-                sentiment_data['positive_score'],
-                sentiment_data['negative_score'],
-                sentiment_data['neutral_score']
-            ))
+                ON CONFLICT(symbol, source, timestamp) DO UPDATE SET
+                    content = excluded.content,
+                    sentiment_score = excluded.sentiment_score,
+                    sentiment_label = excluded.sentiment_label,
+                    compound_score = excluded.compound_score,
+                    positive_score = excluded.positive_score,
+                    negative_score = excluded.negative_score,
+                    neutral_score = excluded.neutral_score
+            ''', [
+                (
+                    row['symbol'],
+                    self._to_datetime(row['timestamp']),
+                    row['source'],
+                    row['content'],
+                    row['sentiment_score'],
+                    row['sentiment_label'],
+                    row['compound_score'],
+                    row['positive_score'],
+                    row['negative_score'],
+                    row['neutral_score']
+                )
+                for row in rows
+            ])
+            self._update_sentiment_rollups(cursor, rows)
             conn.commit()
+        self.invalidate('sentiment_data', [row['symbol'] for row in rows])
+    
+    @staticmethod
+    def _to_datetime(value):
+        """Normalize timestamps so raw rows sort and compare like rollup buckets"""
+        if isinstance(value, str):
+            return datetime.fromisoformat(value)
+        return value
+    
+    @staticmethod
+    def _touched_buckets(rows, resolution):
+        """Distinct (symbol, bucket start, bucket end) strings covering the rows"""
+        label, width = ROLLUP_RESOLUTIONS[resolution]
+        buckets = set()
+        for row in rows:
+            start = datetime.strptime(DatabaseManager._to_datetime(row['timestamp']).strftime(label), '%Y-%m-%d %H:%M:%S')
+            buckets.add((row['symbol'], start))
+        return [
+            (symbol, start.strftime('%Y-%m-%d %H:%M:%S'), (start + width).strftime('%Y-%m-%d %H:%M:%S'))
+            for symbol, start in buckets
+        ]
+    
+    def _update_stock_rollups(self, cursor, rows):
+        """Recompute the 1h buckets touched by new rows from stock_data, then their 1d buckets from 1h"""
+        for resolution, source, time_column in (('1h', 'stock_data', 'timestamp'),
+                                                ('1d', 'stock_rollups', 'bucket')):
+            source_filter = "AND resolution = '1h'" if source == 'stock_rollups' else ''
+            samples = 'SUM(samples)' if source == 'stock_rollups' else 'COUNT(*)'
+            cursor.executemany(f'''
+                INSERT INTO stock_rollups (symbol, resolution, bucket, open_price, high_price,
+                                           low_price, close_price, volume, samples)
+                SELECT :symbol, '{resolution}', :start,
+                       (SELECT open_price FROM {source}
+                        WHERE symbol = :symbol {source_filter}
+                          AND {time_column} >= :start AND {time_column} < :end
+                        ORDER BY {time_column} LIMIT 1),
+                       MAX(high_price), MIN(low_price),
+                       (SELECT close_price FROM {source}
+                        WHERE symbol = :symbol {source_filter}
+                          AND {time_column} >= :start AND {time_column} < :end
+                        ORDER BY {time_column} DESC LIMIT 1),
+                       SUM(volume), {samples}
+                FROM {source}
+                WHERE symbol = :symbol {source_filter}
+                  AND {time_column} >= :start AND {time_column} < :end
+                HAVING COUNT(*) > 0
+                ON CONFLICT(symbol, resolution, bucket) DO UPDATE SET
+                    open_price = excluded.open_price,
+                    high_price = excluded.high_price,
+                    low_price = excluded.low_price,
+                    close_price = excluded.close_price,
+                    volume = excluded.volume,
+                    samples = excluded.samples
+            ''', [
+                {'symbol': symbol, 'start': start, 'end': end}
+                for symbol, start, end in self._touched_buckets(rows, resolution)
+            ])
+    
+    def _update_sentiment_rollups(self, cursor, rows):
+        """Recompute averaged sentiment for the 1h buckets touched by new rows, then their 1d buckets"""
+        columns = ('sentiment_score', 'compound_score', 'positive_score', 'negative_score', 'neutral_score')
+        for resolution, source, time_column in (('1h', 'sentiment_data', 'timestamp'),
+                                                ('1d', 'sentiment_rollups', 'bucket')):
+            if source == 'sentiment_rollups':
+                # Sample-weighted mean of the hourly means
+                averages = ', '.join(f"SUM({c} * samples) / SUM(samples)" for c in columns)
+                samples = 'SUM(samples)'
+                source_filter = "AND resolution = '1h'"
+            else:
+                averages = ', '.join(f"AVG({c})" for c in columns)
+                samples = 'COUNT(*)'
+                source_filter = ''
+            cursor.executemany(f'''
+                INSERT INTO sentiment_rollups (symbol, resolution, bucket, {', '.join(columns)}, samples)
+                SELECT :symbol, '{resolution}', :start, {averages}, {samples}
+                FROM {source}
+                WHERE symbol = :symbol {source_filter}
+                  AND {time_column} >= :start AND {time_column} < :end
+                HAVING COUNT(*) > 0
+                ON CONFLICT(symbol, resolution, bucket) DO UPDATE SET
+                    {', '.join(f"{c} = excluded.{c}" for c in columns)},
+                    samples = excluded.samples
+            ''', [
+                {'symbol': symbol, 'start': start, 'end': end}
+                for symbol, start, end in self._touched_buckets(rows, resolution)
+            ])
+    
+    def rebuild_rollups(self, symbol=None):
+        """Recompute every rollup bucket from raw rows (e.g. for data inserted before rollups existed)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            where = 'WHERE symbol = ?' if symbol else ''
+            params = (symbol,) if symbol else ()
+            stock_rows = [
+                {'symbol': s, 'timestamp': t}
+                for s, t in cursor.execute(f'SELECT DISTINCT symbol, timestamp FROM stock_data {where}', params)
+            ]
+            sentiment_rows = [
+                {'symbol': s, 'timestamp': t}
+                for s, t in cursor.execute(f'SELECT DISTINCT symbol, timestamp FROM sentiment_data {where}', params)
+            ]
+            self._update_stock_rollups(cursor, stock_rows)
+            self._update_sentiment_rollups(cursor, sentiment_rows)
+            conn.commit()
+        self.invalidate('stock_data', [symbol] if symbol else None)
+        self.invalidate('sentiment_data', [symbol] if symbol else None)
+    
+    def _pick_resolution(self, conn, table, symbol, days, max_points):
+        """Finest resolution ('raw', '1h' or '1d') whose point count fits max_points
+
+        Point counts come from the rollup rows themselves: the raw count is
+        the sum of the hourly sample counts.
+        """
+        counts = dict(
+            (resolution, (buckets, samples))
+            for resolution, buckets, samples in conn.execute(f'''
+                SELECT resolution, COUNT(*), SUM(samples)
+                FROM {table}
+                WHERE symbol = ? AND bucket >= datetime('now', ?)
+                GROUP BY resolution
+            ''', (symbol, f'-{int(days)} days'))
+        )
+        if '1h' not in counts:
+            return 'raw'
+        
+        candidates = [('raw', counts['1h'][1]), ('1h', counts['1h'][0]), ('1d', counts.get('1d', (0, 0))[0])]
+        for resolution, points in candidates:
+            if points <= max_points:
+                return resolution
+        return '1d'
     
     def insert_prediction(self, symbol, prediction_data):
         """Insert prediction into database"""
+        self.insert_prediction_many([dict(prediction_data, symbol=symbol)])
+    
+    def insert_prediction_many(self, rows):
+        """Insert many predictions (dicts with a 'symbol' key) in one transaction"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
+            cursor.executemany('''
                 INSERT INTO predictions (symbol, timestamp, model_name, prediction_price,
                                        confidence_score, prediction_horizon)
                 VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (
+                    row['symbol'],
+                    row['timestamp'],
+                    row['model_name'],
+                    row['prediction_price'],
+                    row['confidence_score'],
+                    row['prediction_horizon']
+                )
+                for row in rows
+            ])
+            conn.commit()
+    
+    def insert_model_performance(self, model_name, symbol, metrics):
+        """Record a model's evaluation metrics (dict of accuracy/mse/rmse/mae/r2_score)"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                INSERT INTO model_performance (model_name, symbol, accuracy, mse, rmse, mae,
+                                             r2_score, last_trained)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
+                model_name,
                 symbol,
-                prediction_data['timestamp'],
-                prediction_data['model_name'],
-                prediction_data['prediction_price'],
-                prediction_data['confidence_score'],
-                prediction_data['prediction_horizon']
+                metrics.get('accuracy'),
+                metrics.get('mse'),
+                metrics.get('rmse'),
+                metrics.get('mae'),
+                metrics.get('r2_score'),
+                metrics.get('last_trained') or datetime.now()
             ))
             conn.commit()
+        # Cached get_model_performance reads are table-wide
+        self.invalidate('model_performance')
     
     def update_prediction_accuracy(self, prediction_id, actual_price):
         """Update prediction accuracy when actual price is known"""
@@ -201,9 +677,120 @@ class DatabaseManager:
             ''', (actual_price, actual_price, prediction_id))
             conn.commit()
     
-    def get_historical_data(self, symbol, days=30):
-        """Get historical stock data"""
+    def upsert_fundamentals(self, fundamentals):
+        """Insert or update fundamentals rows (list of dicts keyed by symbol)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO fundamentals (symbol, market_cap, pe_ratio, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(symbol) DO UPDATE SET
+                    market_cap = excluded.market_cap,
+                    pe_ratio = excluded.pe_ratio,
+                    updated_at = excluded.updated_at
+            ''', [
+                (
+                    row['symbol'],
+                    row['market_cap'],
+                    row['pe_ratio'],
+                    row['updated_at']
+                )
+                for row in fundamentals
+            ])
+            conn.commit()
+    
+    def get_fundamentals(self):
+        """Get stored fundamentals keyed by symbol"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT symbol, market_cap, pe_ratio, updated_at FROM fundamentals')
+            return {
+                symbol: {
+                    'market_cap': market_cap,
+                    'pe_ratio': pe_ratio,
+                    'updated_at': updated_at
+                }
+                for symbol, market_cap, pe_ratio, updated_at in cursor.fetchall()
+            }
+    
+    def upsert_daily_bars(self, symbol, bars):
+        """Insert or replace daily bars given as (date, open, high, low, close, volume) tuples"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO daily_bars (symbol, date, open_price, high_price,
+                                                   low_price, close_price, volume)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', [(symbol, *bar) for bar in bars])
+            conn.commit()
+    
+    def get_daily_bars(self, symbol, start_date, end_date):
+        """Get cached daily bars between two 'YYYY-MM-DD' dates (inclusive)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT date, open_price, high_price, low_price, close_price, volume
+                FROM daily_bars
+                WHERE symbol = ? AND date >= ? AND date <= ?
+                ORDER BY date
+            ''', (symbol, start_date, end_date))
+            return cursor.fetchall()
+    
+    def fetch_daily_bars(self, symbol, start_date, end_date):
+        """Cached daily bars between two 'YYYY-MM-DD' dates (inclusive) as a BarSeries"""
+        with self.get_connection() as conn:
+            return self._read_bars(conn, symbol, 'daily_bars', 'date', 'symbol = ? AND date >= ? AND date <= ?',
+                                   (symbol, start_date, end_date), unit='D')
+    
+    def get_history_coverage(self, symbol):
+        """Get the (start_date, end_date, updated_at) range cached for a symbol"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT start_date, end_date, updated_at
+                FROM history_coverage
+                WHERE symbol = ?
+            ''', (symbol,))
+            return cursor.fetchone()
+    
+    def set_history_coverage(self, symbol, start_date, end_date):
+        """Record the date range cached for a symbol"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO history_coverage (symbol, start_date, end_date, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(symbol) DO UPDATE SET
+                    start_date = excluded.start_date,
+                    end_date = excluded.end_date,
+                    updated_at = excluded.updated_at
+            ''', (symbol, start_date, end_date, datetime.now()))
+            conn.commit()
+    
+    @cached_query('stock_data')
+    def get_historical_data(self, symbol, days=30, columnar=False, max_points=None):
+        """Get historical stock data (a DataFrame, or a BarSeries when columnar)
+
+        With ``max_points`` the finest of raw / 1h / 1d rows that fits the
+        budget is returned, so long windows read rollups instead of raw rows.
+        """
         with self.get_connection() as conn:
+            resolution = self._pick_resolution(conn, 'stock_rollups', symbol, days, max_points) if max_points else 'raw'
+            if columnar:
+                return self._read_stock_bars(conn, symbol, days, resolution)
+            
+            if resolution != 'raw':
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT bucket, open_price, high_price, low_price, close_price, volume
+                    FROM stock_rollups
+                    WHERE symbol = ? AND resolution = ? AND bucket >= datetime('now', ?)
+                    ORDER BY bucket
+                ''', (symbol, resolution, f'-{int(days)} days'))
+                return pd.DataFrame(
+                    cursor.fetchall(), columns=['timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume']
+                )[['timestamp', 'open_price', 'close_price', 'high_price', 'low_price', 'volume']]
+            
             query = '''
                 SELECT timestamp, open_price, close_price, high_price, low_price, volume
                 FROM stock_data 
@@ -211,11 +798,25 @@ class DatabaseManager:
                 ORDER BY timestamp
             '''.format(days)
             
-            return pd.read_sql_query(query, conn, params=(symbol,))
+            frame = pd.read_sql_query(query, conn, params=(symbol,))
+            archived = self._archived_rows(conn, 'stock_data', symbol, days, list(frame.columns))
+            if archived is not None:
+                frame = pd.concat([archived, frame], ignore_index=True)
+            return frame
     
-    def get_sentiment_history(self, symbol, days=7):
-        """Get sentiment history for a stock"""
+    @cached_query('sentiment_data')
+    def get_sentiment_history(self, symbol, days=7, max_points=None):
+        """Get sentiment history for a stock (rolled up to fit ``max_points`` if given)"""
         with self.get_connection() as conn:
+            resolution = self._pick_resolution(conn, 'sentiment_rollups', symbol, days, max_points) if max_points else 'raw'
+            if resolution != 'raw':
+                return pd.read_sql_query('''
+                    SELECT bucket AS timestamp, compound_score, positive_score, negative_score, neutral_score
+                    FROM sentiment_rollups
+                    WHERE symbol = ? AND resolution = ? AND bucket >= datetime('now', ?)
+                    ORDER BY bucket
+                ''', conn, params=(symbol, resolution, f'-{int(days)} days'))
+            
             query = '''
                 SELECT timestamp, compound_score, positive_score, negative_score, neutral_score
                 FROM sentiment_data 
@@ -223,8 +824,94 @@ class DatabaseManager:
                 ORDER BY timestamp
             '''.format(days)
             
-            return pd.read_sql_query(query, conn, params=(symbol,))
+            frame = pd.read_sql_query(query, conn, params=(symbol,))
+            archived = self._archived_rows(conn, 'sentiment_data', symbol, days, list(frame.columns))
+            if archived is not None:
+                frame = pd.concat([archived, frame], ignore_index=True)
+            return frame
     
+    @cached_query('stock_data')
+    def fetch_bars(self, symbol, days=30, max_points=None):
+        """Bars of the last ``days`` days as a BarSeries, without pandas
+
+        Same rows as ``get_historical_data`` (archive and rollups included),
+        but the cursor is streamed straight into preallocated NumPy arrays
+        with timestamps parsed once to int64 epoch seconds. Use this for bulk
+        loads such as model training and backtests.
+        """
+        with self.get_connection() as conn:
+            resolution = self._pick_resolution(conn, 'stock_rollups', symbol, days, max_points) if max_points else 'raw'
+            return self._read_stock_bars(conn, symbol, days, resolution)
+    
+    def _read_stock_bars(self, conn, symbol, days, resolution):
+        window = f'-{int(days)} days'
+        if resolution != 'raw':
+            return self._read_bars(conn, symbol, 'stock_rollups', 'bucket',
+                                   "symbol = ? AND resolution = ? AND bucket >= datetime('now', ?)",
+                                   (symbol, resolution, window))
+        
+        series = self._read_bars(conn, symbol, 'stock_data', 'timestamp',
+                                 "symbol = ? AND timestamp >= datetime('now', ?)", (symbol, window))
+        
+        bounds = self._archive_window(conn, 'stock_data', symbol, days)
+        if bounds is None:
+            return series
+        columns = ['timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume']
+        archived = self.archive.read_arrays('stock_data', symbol, columns, *bounds)
+        if not len(archived['timestamp']):
+            return series
+        return BarSeries.concat(symbol, [
+            BarSeries(
+                symbol,
+                archived['timestamp'].astype(np.int64).view('datetime64[s]'),
+                *(archived[column].astype(np.float64) for column in columns[1:5]),
+                # A NULL volume reads back as NaN; count it as zero, not int64 min
+                np.nan_to_num(archived['volume'].astype(np.float64), nan=0.0).astype(np.int64)
+            ),
+            series
+        ])
+    
+    @staticmethod
+    def _read_bars(conn, symbol, table, time_column, where, params, unit='s'):
+        """Stream the OHLCV rows of a bar table matching ``where`` into a BarSeries"""
+        if not conn.in_transaction:
+            # Count and rows must come from the same snapshot
+            conn.execute('BEGIN')
+        count = conn.execute(f'SELECT COUNT(*) FROM {table} WHERE {where}', params).fetchone()[0]
+        cursor = conn.execute(f'''
+            SELECT {time_column}, open_price, high_price, low_price, close_price, IFNULL(volume, 0)
+            FROM {table}
+            WHERE {where}
+            ORDER BY {time_column}
+        ''', params)
+        return BarSeries.from_cursor(symbol, cursor, count, unit=unit)
+    
+    def _archive_window(self, conn, table, symbol, days):
+        """(start, end) of the archived part of a window that reaches past the hot table, else None
+
+        The end is the symbol's oldest hot row, so rows present in both tiers
+        are never returned twice.
+        """
+        if not self.archive.has_table(table):
+            return None
+        
+        start, hot_start = conn.execute(f'''
+            SELECT datetime('now', ?), MIN(timestamp) FROM {table} WHERE symbol = ?
+        ''', (f'-{int(days)} days', symbol)).fetchone()
+        if hot_start is not None and start >= hot_start:
+            return None
+        return start, hot_start
+    
+    def _archived_rows(self, conn, table, symbol, days, columns):
+        """Archived rows (a DataFrame) of a window that reaches past the hot table, else None"""
+        bounds = self._archive_window(conn, table, symbol, days)
+        if bounds is None:
+            return None
+        
+        archived = self.archive.read(table, symbol, start=bounds[0], end=bounds[1], columns=columns)
+        return archived if not archived.empty else None
+    
+    @cached_query('model_performance', by_symbol=False)
     def get_model_performance(self, model_name=None):
         """Get model performance metrics"""
         with self.get_connection() as conn:
@@ -242,13 +929,13 @@ class DatabaseManager:
                 '''
                 return pd.read_sql_query(query, conn)
     
-    def update_portfolio(self, symbol, quantity, action, current_price=None):
+    def update_portfolio(self, symbol, quantity, action, current_price=None, portfolio_id='default'):
         """Update portfolio holdings"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
             # Check if stock exists in portfolio
-            cursor.execute('SELECT * FROM portfolio WHERE symbol = ?', (symbol,))
+            cursor.execute('SELECT * FROM portfolio WHERE portfolio_id = ? AND symbol = ?', (portfolio_id, symbol))
             existing = cursor.fetchone()
             
             if existing:
@@ -263,88 +950,278 @@ class DatabaseManager:
                 cursor.execute('''
                     UPDATE portfolio 
                     SET quantity = ?, current_price = ?, last_updated = CURRENT_TIMESTAMP
-                    WHERE symbol = ?
-                ''', (new_quantity, current_price, symbol))
+                    WHERE portfolio_id = ? AND symbol = ?
+                ''', (new_quantity, current_price, portfolio_id, symbol))
             else:
                 # Insert new record
                 if action == 'buy':
                     cursor.execute('''
-                        INSERT INTO portfolio (symbol, quantity, buy_price, current_price)
-                        VALUES (?, ?, ?, ?)
-                    ''', (symbol, quantity, current_price, current_price))
+                        INSERT INTO portfolio (portfolio_id, symbol, quantity, buy_price, current_price)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', (portfolio_id, symbol, quantity, current_price, current_price))
             
             conn.commit()
             return {'success': True, 'message': f'Portfolio updated for {symbol}'}
     
-    def get_portfolio(self):
-        """Get current portfolio"""
+    def get_portfolio(self, portfolio_id='default'):
+        """Get current portfolio, marked to market against latest_prices
+
+        Holdings without a latest price fall back to the price recorded at
+        trade time; ``price_timestamp`` says which price was used.
+        """
         with self.get_connection() as conn:
-            query = '''
-                SELECT symbol, quantity, buy_price, current_price, 
-                       (quantity * current_price) as total_value,
-                       ((current_price - buy_price) * quantity) as profit_loss,
-                       (((current_price - buy_price) / buy_price) * 100) as profit_loss_percent
-                FROM portfolio 
-                WHERE quantity > 0
+            cursor = conn.execute('''
+                SELECT p.symbol, p.quantity, p.buy_price, 
+                       COALESCE(l.price, p.current_price) as current_price,
+                       (p.quantity * COALESCE(l.price, p.current_price)) as total_value,
+                       ((COALESCE(l.price, p.current_price) - p.buy_price) * p.quantity) as profit_loss,
+                       (((COALESCE(l.price, p.current_price) - p.buy_price) / p.buy_price) * 100) as profit_loss_percent,
+                       l.timestamp as price_timestamp
+                FROM portfolio p
+                LEFT JOIN latest_prices l ON l.symbol = p.symbol
+                WHERE p.portfolio_id = ? AND p.quantity > 0
                 ORDER BY total_value DESC
-            '''
-            return pd.read_sql_query(query, conn).to_dict('records')
+            ''', (portfolio_id,))
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+    
+    def value_portfolios(self, portfolio_ids=None):
+        """Mark-to-market totals for many portfolios (all when None) in one query
+
+        Returns ``{portfolio_id: {...}}`` with holdings, market value, cost
+        basis, P&L and the oldest price used (``priced_as_of``).
+        """
+        where = ''
+        params = ()
+        if portfolio_ids is not None:
+            portfolio_ids = list(portfolio_ids)
+            if not portfolio_ids:
+                return {}
+            where = f"AND p.portfolio_id IN ({', '.join('?' * len(portfolio_ids))})"
+            params = tuple(portfolio_ids)
+        
+        with self.get_connection() as conn:
+            rows = conn.execute(f'''
+                SELECT p.portfolio_id,
+                       COUNT(*),
+                       SUM(p.quantity * COALESCE(l.price, p.current_price)),
+                       SUM(p.quantity * p.buy_price),
+                       MIN(l.timestamp)
+                FROM portfolio p
+                LEFT JOIN latest_prices l ON l.symbol = p.symbol
+                WHERE p.quantity > 0 {where}
+                GROUP BY p.portfolio_id
+            ''', params).fetchall()
+        
+        valuations = {}
+        for portfolio_id, holdings, market_value, cost_basis, priced_as_of in rows:
+            profit_loss = (market_value - cost_basis) if market_value is not None and cost_basis is not None else None
+            valuations[portfolio_id] = {
+                'holdings': holdings,
+                'market_value': market_value,
+                'cost_basis': cost_basis,
+                'profit_loss': profit_loss,
+                'profit_loss_percent': profit_loss / cost_basis * 100 if profit_loss is not None and cost_basis else None,
+                'priced_as_of': priced_as_of
+            }
+        return valuations
     
     def insert_news_article(self, article_data):
         """Insert news article into database"""
+        self.insert_news_articles_many([article_data])
+    
+    def insert_news_articles_many(self, articles):
+        """Upsert many news articles in one transaction
+
+        Articles are keyed by symbol and a hash of their URL (see
+        ``_news_hash``); re-reading a known article only refreshes its
+        content and sentiment.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
+            cursor.executemany('''
                 INSERT INTO news_articles (symbol, title, url, source, published_date, 
-                                         content, sentiment_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                article_data['symbol'],
-                article_data['title'],
-                article_data['url'],
-                article_data['source'],
-                article_data['published_date'],
-                article_data['content'],
-                article_data['sentiment_score']
-            ))
+                                         content, sentiment_score, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(symbol, content_hash) DO UPDATE SET
+                    content = excluded.content,
+                    sentiment_score = excluded.sentiment_score
+            ''', [
+                (
+                    article['symbol'],
+                    article['title'],
+                    article['url'],
+                    article['source'],
+                    article['published_date'],
+                    article['content'],
+                    article['sentiment_score'],
+                    self._news_hash(article)
+                )
+                for article in articles
+            ])
             conn.commit()
+        self.invalidate('news_articles', [article['symbol'] for article in articles])
     
+    @cached_query('news_articles')
     def get_recent_news(self, symbol, limit=10):
         """Get recent news for a stock"""
         with self.get_connection() as conn:
-            query = '''
+            cursor = conn.execute('''
                 SELECT title, url, source, published_date, sentiment_score
                 FROM news_articles 
                 WHERE symbol = ? 
                 ORDER BY published_date DESC 
                 LIMIT ?
-            '''
-            return pd.read_sql_query(query, conn, params=(symbol, limit)).to_dict('records')
+            ''', (symbol, limit))
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
     
-    def cleanup_old_data(self, days=90):
-        """Clean up old data to keep database size manageable"""
+    def search_news(self, query, symbol=None, limit=20):
+        """Full-text search over stored news titles and content, best matches first
+
+        Every word of ``query`` must appear (stemmed, case-insensitive);
+        FTS5 operators in the query are treated as plain words.
+        """
+        terms = re.findall(r'\w+', query or '')
+        if not terms:
+            return []
+        
+        match = ' '.join(f'"{term}"' for term in terms)
+        where = 'AND a.symbol = ?' if symbol else ''
+        params = (match, symbol, limit) if symbol else (match, limit)
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Clean up old stock data
-            cursor.execute('''
-                DELETE FROM stock_data 
-                WHERE timestamp < datetime('now', '-{} days')
-            '''.format(days))
+            cursor = conn.execute(f'''
+                SELECT a.symbol, a.title, a.url, a.source, a.published_date, a.sentiment_score,
+                       snippet(news_fts, 1, '[', ']', '...', 16) as snippet,
+                       bm25(news_fts) as rank
+                FROM news_fts
+                JOIN news_articles a ON a.id = news_fts.rowid
+                WHERE news_fts MATCH ? {where}
+                ORDER BY rank
+                LIMIT ?
+            ''', params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+    
+    def cleanup_old_data(self, days=None, archive=None, batch_size=None, pause=None):
+        """Clean up old data to keep database size manageable
+
+        Rows are removed in rowid order, ``batch_size`` at a time, each batch
+        in its own short transaction with a ``pause`` in between so ingestion
+        writers are never locked out for long. Unless ``archive`` is False
+        (default: ``Config.ARCHIVE_ENABLED``), each batch is copied to the
+        Parquet archive before it is deleted. Returns per-table row counts
+        and timings.
+        """
+        days = Config.RETENTION_DAYS if days is None else days
+        archive = Config.ARCHIVE_ENABLED if archive is None else archive
+        batch_size = batch_size or Config.RETENTION_BATCH_SIZE
+        pause = Config.RETENTION_BATCH_PAUSE if pause is None else pause
+        if archive and not self.archive.available:
+            raise RuntimeError("Archiving requires pyarrow; pass archive=False to delete without archiving")
+        
+        with self.get_connection() as conn:
+            cutoff = conn.execute("SELECT datetime('now', ?)", (f'-{int(days)} days',)).fetchone()[0]
+        
+        report = {'cutoff': cutoff, 'tables': {}}
+        started = time.monotonic()
+        for table in RETENTION_TABLES:
+            table_started = time.monotonic()
+            deleted, batches, last_rowid = 0, 0, 0
             
-            # Clean up old sentiment data
-            cursor.execute('''
-                DELETE FROM sentiment_data 
-                WHERE timestamp < datetime('now', '-{} days')
-            '''.format(days))
+            while True:
+                with self.get_connection() as conn:
+                    if archive:
+                        aged = pd.read_sql_query(f'''
+                            SELECT rowid AS _rowid, * FROM {table}
+                            WHERE rowid > ? AND timestamp < ?
+                            ORDER BY rowid LIMIT ?
+                        ''', conn, params=(last_rowid, cutoff, batch_size))
+                        rowids = aged.pop('_rowid').tolist()
+                        self.archive.write(table, aged, key=ARCHIVE_KEYS[table])
+                    else:
+                        rowids = [row[0] for row in conn.execute(f'''
+                            SELECT rowid FROM {table}
+                            WHERE rowid > ? AND timestamp < ?
+                            ORDER BY rowid LIMIT ?
+                        ''', (last_rowid, cutoff, batch_size))]
+                    
+                    if not rowids:
+                        break
+                    conn.execute(f'''
+                        DELETE FROM {table}
+                        WHERE rowid BETWEEN ? AND ? AND timestamp < ?
+                    ''', (rowids[0], rowids[-1], cutoff))
+                
+                self.invalidate(table)
+                deleted += len(rowids)
+                batches += 1
+                last_rowid = rowids[-1]
+                if len(rowids) < batch_size:
+                    break
+                # Give queued writers a chance at the lock between batches
+                time.sleep(pause)
             
-            # Clean up old predictions
-            cursor.execute('''
-                DELETE FROM predictions 
-                WHERE timestamp < datetime('now', '-{} days')
-            '''.format(days))
+            report['tables'][table] = {
+                'rows': deleted,
+                'batches': batches,
+                'seconds': round(time.monotonic() - table_started, 3)
+            }
+        
+        report['seconds'] = round(time.monotonic() - started, 3)
+        logger.info(f"Retention removed rows older than {cutoff}: {report['tables']} in {report['seconds']}s")
+        return report
+    
+    def incremental_vacuum(self, pages=None):
+        """Return up to ``pages`` free pages to the OS (needs auto_vacuum = INCREMENTAL)"""
+        pages = pages or Config.INCREMENTAL_VACUUM_PAGES
+        with self.get_connection() as conn:
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                return {'mode': 'none', 'pages_freed': 0, 'free_pages': conn.execute('PRAGMA freelist_count').fetchone()[0]}
             
-            conn.commit()
+            before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            # executescript steps the pragma to completion; execute() frees a single page
+            conn.executescript(f'PRAGMA incremental_vacuum({int(pages)});')
+            after = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            return {'mode': 'incremental', 'pages_freed': before - after, 'free_pages': after}
+    
+    def convert_to_incremental_vacuum(self):
+        """Switch an existing database to incremental auto-vacuum
+
+        Requires one full ``VACUUM``, which rewrites the file and holds the
+        write lock for its whole duration, so run it during a quiet period.
+        """
+        with self.get_connection() as conn:
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+            return conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+    
+    def optimize(self, analyze=False):
+        """Refresh query planner statistics (``ANALYZE`` when asked, then ``PRAGMA optimize``)"""
+        with self.get_connection() as conn:
+            if analyze:
+                conn.execute('ANALYZE')
+            conn.execute('PRAGMA optimize')
+    
+    def run_maintenance(self, days=None, analyze=False):
+        """Retention, incremental vacuum and planner statistics, with timings"""
+        report = {}
+        started = time.monotonic()
+        
+        report['retention'] = self.cleanup_old_data(days)
+        
+        step = time.monotonic()
+        report['vacuum'] = self.incremental_vacuum()
+        report['vacuum']['seconds'] = round(time.monotonic() - step, 3)
+        
+        step = time.monotonic()
+        self.optimize(analyze=analyze)
+        report['optimize'] = {'analyze': analyze, 'seconds': round(time.monotonic() - step, 3)}
+        
+        report['seconds'] = round(time.monotonic() - started, 3)
+        report['finished_at'] = datetime.now().isoformat()
+        logger.info(f"Database maintenance finished in {report['seconds']}s")
+        return report
     
     def get_database_stats(self):
         """Get database statistics"""
@@ -363,4 +1240,7 @@ class DatabaseManager:
             cursor.execute("SELECT page_count * page_size as size FROM pragma_page_count(), pragma_page_size()")
             stats['database_size_bytes'] = cursor.fetchone()[0]
             
+            if self.query_cache is not None:
+                stats['query_cache'] = self.query_cache.stats()
+            
             return stats
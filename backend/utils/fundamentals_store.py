@@ -0,0 +1,166 @@
+import threading
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import sys
+import os
+
+import yfinance as yf
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+from utils.database_manager import DatabaseManager
+from utils.provider_tape import provider_tape
+
+logger = logging.getLogger(__name__)
+
+class FundamentalsStore:
+    """In-memory view of slow-moving fundamentals (market cap, P/E)
+
+    Values are persisted in the ``fundamentals`` table and refreshed on their
+    own schedule, so the quote hot path only does a dictionary lookup and
+    never waits on ``ticker.info``. A symbol whose fetch fails is not retried
+    until its backoff (doubling per failure, capped at the refresh interval)
+    has passed.
+    """
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None,
+                 refresh_interval: Optional[int] = None):
+        self.db_manager = db_manager or DatabaseManager(Config.DATABASE_PATH)
+        self.refresh_interval = refresh_interval or Config.FUNDAMENTALS_UPDATE_INTERVAL
+        self._data = {}
+        self._pending = set()
+        self._failures = {}  # symbol -> (consecutive failed fetches, retry not before)
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker = None
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Get fundamentals for a symbol from memory
+
+        Missing or outdated symbols are queued for a background refresh; the
+        caller gets whatever is held right now (possibly None).
+        """
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._data.get(symbol)
+            if (entry is None or self._is_stale(entry)) and not self._backing_off(symbol):
+                self._pending.add(symbol)
+                self._ensure_worker()
+                self._wakeup.set()
+            return entry
+
+    def refresh(self, symbols: Iterable[str]) -> int:
+        """Fetch fundamentals for symbols now and persist them"""
+        rows = []
+        failed = []
+        for symbol in symbols:
+            row = self._fetch(symbol)
+            if row:
+                rows.append(row)
+            else:
+                failed.append(symbol)
+
+        with self._lock:
+            for row in rows:
+                self._data[row['symbol']] = row
+                self._failures.pop(row['symbol'], None)
+            for symbol in failed:
+                self._record_failure(symbol)
+
+        if rows:
+            try:
+                self.db_manager.upsert_fundamentals(rows)
+            except Exception as e:
+                logger.error(f"Error persisting fundamentals: {e}")
+
+        return len(rows)
+
+    def refresh_stale(self, symbols: Optional[Iterable[str]] = None) -> int:
+        """Refresh every known (or given) symbol whose values are outdated"""
+        self._ensure_loaded()
+        with self._lock:
+            candidates = list(symbols) if symbols is not None else list(self._data)
+            stale = [
+                s for s in candidates
+                if (s not in self._data or self._is_stale(self._data[s])) and not self._backing_off(s)
+            ]
+        return self.refresh(stale)
+
+    def _fetch(self, symbol: str) -> Optional[Dict]:
+        """Fetch fundamentals for one symbol from Yahoo Finance"""
+        try:
+            info = provider_tape.call(
+                'yahoo_finance', f"info:{symbol}",
+                lambda: yf.Ticker(symbol).info,
+                encode=lambda info: {'marketCap': info.get('marketCap'), 'trailingPE': info.get('trailingPE')}
+            )
+            return {
+                'symbol': symbol,
+                'market_cap': info.get('marketCap', 0) or 0,
+                'pe_ratio': info.get('trailingPE', 0) or 0,
+                'updated_at': datetime.now()
+            }
+        except Exception as e:
+            logger.error(f"Fundamentals fetch error for {symbol}: {e}")
+            return None
+
+    def _is_stale(self, entry: Dict) -> bool:
+        return datetime.now() - entry['updated_at'] > timedelta(seconds=self.refresh_interval)
+
+    def _backing_off(self, symbol: str) -> bool:
+        """Whether a recent failed fetch still blocks retrying symbol (caller holds the lock)"""
+        failure = self._failures.get(symbol)
+        return failure is not None and datetime.now() < failure[1]
+
+    def _record_failure(self, symbol: str):
+        """Push back the next fetch of symbol exponentially (caller holds the lock)"""
+        count = self._failures.get(symbol, (0, None))[0] + 1
+        delay = min(Config.FUNDAMENTALS_RETRY_BACKOFF * 2 ** (count - 1), self.refresh_interval)
+        self._failures[symbol] = (count, datetime.now() + timedelta(seconds=delay))
+
+    def _ensure_loaded(self):
+        """Load persisted fundamentals once per process"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                self.db_manager.initialize_database()
+                for symbol, row in self.db_manager.get_fundamentals().items():
+                    self._data[symbol] = {
+                        'symbol': symbol,
+                        'market_cap': row['market_cap'] or 0,
+                        'pe_ratio': row['pe_ratio'] or 0,
+                        'updated_at': datetime.fromisoformat(str(row['updated_at']))
+                    }
+            except Exception as e:
+                logger.error(f"Error loading fundamentals: {e}")
+
+    def _ensure_worker(self):
+        """Start the background refresh thread (caller holds the lock)"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='fundamentals-refresh', daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        """Drain queued symbols in batches, and re-check everything on the slow interval"""
+        while True:
+            self._wakeup.wait(timeout=self.refresh_interval)
+            self._wakeup.clear()
+
+            with self._lock:
+                pending: List[str] = list(self._pending)
+                self._pending.clear()
+
+            try:
+                if pending:
+                    self.refresh(pending)
+                else:
+                    self.refresh_stale()
+            except Exception as e:
+                logger.error(f"Fundamentals refresh error: {e}")
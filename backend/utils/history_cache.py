@@ -0,0 +1,123 @@
+import threading
+import logging
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import sys
+import os
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+from utils.database_manager import DatabaseManager
+from utils.bars import BarSeries
+
+logger = logging.getLogger(__name__)
+
+class HistoryCache:
+    """Persistent per-symbol daily bar cache with gap filling
+
+    Each symbol records the date range already downloaded. A request only
+    fetches the leading/trailing gaps outside that range; everything else is
+    served from the local ``daily_bars`` table. The most recent day is
+    re-fetched at most once per ``refresh_interval`` since its bar is still
+    forming during the session.
+    """
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None,
+                 refresh_interval: Optional[int] = None):
+        self.db_manager = db_manager or DatabaseManager(Config.DATABASE_PATH)
+        self.refresh_interval = refresh_interval or Config.STOCK_DATA_UPDATE_INTERVAL
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    def get_bars(self, symbol: str, start_date: date, end_date: date,
+                 fetch: Callable[[str, date, date], pd.DataFrame],
+                 columnar: bool = False) -> Union[List[Dict], BarSeries]:
+        """Get daily bars for [start_date, end_date], fetching only missing gaps
+
+        ``fetch(symbol, start, end)`` must return a Yahoo-style history frame
+        (Open/High/Low/Close/Volume indexed by date) for the inclusive range.
+        Returns a ``BarSeries`` when ``columnar`` is set, else a list of dicts.
+        """
+        self._ensure_initialized()
+
+        start = start_date.isoformat()
+        end = end_date.isoformat()
+        new_start, new_end = start, end
+
+        coverage = self.db_manager.get_history_coverage(symbol)
+        if coverage:
+            new_start, new_end = min(start, coverage[0]), max(end, coverage[1])
+
+        gaps = self._find_gaps(start_date, end_date, coverage)
+        try:
+            for gap_start, gap_end in gaps:
+                bars = self._bars_from_history(fetch(symbol, gap_start, gap_end))
+                if bars:
+                    self.db_manager.upsert_daily_bars(symbol, bars)
+                elif not coverage:
+                    # Nothing known locally and nothing upstream: don't record coverage
+                    return BarSeries.empty(symbol) if columnar else []
+            if gaps:
+                self.db_manager.set_history_coverage(symbol, new_start, new_end)
+        except Exception as e:
+            if not coverage:
+                raise
+            logger.error(f"Error filling history gaps for {symbol}, serving cached bars: {e}")
+
+        series = self.db_manager.fetch_daily_bars(symbol, start, end)
+        return series if columnar else series.to_records()
+
+    def _find_gaps(self, start_date: date, end_date: date,
+                   coverage: Optional[Tuple]) -> List[Tuple[date, date]]:
+        """Date ranges in the request that are not cached yet"""
+        if not coverage:
+            return [(start_date, end_date)]
+
+        covered_start = date.fromisoformat(coverage[0])
+        covered_end = date.fromisoformat(coverage[1])
+        updated_at = datetime.fromisoformat(str(coverage[2]))
+        gaps = []
+
+        if start_date < covered_start:
+            gaps.append((start_date, covered_start - timedelta(days=1)))
+
+        # The last covered day may have been a partial bar; re-fetch it once it
+        # has aged past the refresh interval, together with any newer days
+        last_bar_settled = (
+            covered_end < updated_at.date()
+            or datetime.now() - updated_at < timedelta(seconds=self.refresh_interval)
+        )
+        if end_date > covered_end:
+            resume_from = covered_end + timedelta(days=1) if last_bar_settled else covered_end
+            gaps.append((resume_from, end_date))
+        elif end_date == covered_end and not last_bar_settled:
+            gaps.append((covered_end, end_date))
+
+        return gaps
+
+    @staticmethod
+    def _bars_from_history(hist: pd.DataFrame) -> List[Tuple]:
+        """Convert a history frame to bar tuples column-wise (no iterrows)"""
+        if hist is None or hist.empty:
+            return []
+
+        return list(zip(
+            hist.index.strftime('%Y-%m-%d'),
+            hist['Open'].astype(float).tolist(),
+            hist['High'].astype(float).tolist(),
+            hist['Low'].astype(float).tolist(),
+            hist['Close'].astype(float).tolist(),
+            hist['Volume'].astype('int64').tolist()
+        ))
+
+    def _ensure_initialized(self):
+        """Create tables once per process"""
+        if self._initialized:
+            return
+        with self._lock:
+            if not self._initialized:
+                self.db_manager.initialize_database()
+                self._initialized = True
@@ -0,0 +1,132 @@
+import threading
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict
+import sys
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+_async_sessions = {}  # event loop -> aiohttp.ClientSession
+_async_counters = {'requests': 0, 'connections_created': 0, 'connections_reused': 0}
+
+def get_session() -> requests.Session:
+    """Get the process-wide keep-alive session used by the REST collectors
+
+    Connections are pooled per host, retried with exponential backoff on
+    connection errors and 429/5xx responses, and kept alive between calls.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=Config.HTTP_MAX_RETRIES,
+        backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(
+        pool_connections=Config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+def session_stats() -> Dict:
+    """Connection reuse counters for the sync and async sessions"""
+    stats = {'requests': 0, 'connections_created': 0, 'connections_reused': 0, 'pools': 0}
+
+    if _session is not None:
+        for adapter in set(_session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats['pools'] += 1
+                stats['requests'] += pool.num_requests
+                stats['connections_created'] += pool.num_connections
+        stats['connections_reused'] = stats['requests'] - stats['connections_created']
+
+    return {
+        'sync': stats,
+        'async': dict(_async_counters)
+    }
+
+def _build_trace_config():
+    """aiohttp trace hooks feeding the async reuse counters"""
+    import aiohttp
+
+    async def on_request_start(session, context, params):
+        _async_counters['requests'] += 1
+
+    async def on_connection_create_end(session, context, params):
+        _async_counters['connections_created'] += 1
+
+    async def on_connection_reuseconn(session, context, params):
+        _async_counters['connections_reused'] += 1
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    return trace_config
+
+@asynccontextmanager
+async def async_session():
+    """Yield the pooled aiohttp session for the running event loop
+
+    aiohttp sessions are bound to one loop, so one session (and connector)
+    is kept per loop and reused by every caller on it.
+    """
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+
+    # Forget sessions whose loops were closed without close_async_session()
+    for stale_loop in [l for l in list(_async_sessions) if l.is_closed()]:
+        del _async_sessions[stale_loop]
+
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=Config.HTTP_POOL_MAXSIZE,
+            limit_per_host=Config.HTTP_POOL_CONNECTIONS,
+            keepalive_timeout=Config.HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=Config.HTTP_TIMEOUT),
+            trace_configs=[_build_trace_config()]
+        )
+        _async_sessions[loop] = session
+    yield session
+
+async def close_async_session():
+    """Close the pooled aiohttp session of the running loop, if any"""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
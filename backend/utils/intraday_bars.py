@@ -0,0 +1,239 @@
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+from utils.bars import BarSeries
+from utils.synthetic_market import is_simulated
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_SECONDS = {'1m': 60, '5m': 300, '15m': 900, '30m': 1800, '1h': 3600}
+
+# Column order of the per-symbol "bar in progress" array
+START, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+class _IntervalBuffers:
+    """Ring buffers of closed bars plus the bar in progress, one row per symbol"""
+
+    def __init__(self, seconds: int, capacity: int, rows: int):
+        self.seconds = seconds
+        self.capacity = capacity
+        self.current = np.full((rows, 6), np.nan)
+        self.start = np.zeros((rows, capacity), dtype=np.int64)
+        self.ohlc = np.zeros((rows, capacity, 4))
+        self.volume = np.zeros((rows, capacity), dtype=np.int64)
+        self.head = np.zeros(rows, dtype=np.int64)  # next write slot
+        self.count = np.zeros(rows, dtype=np.int64)
+
+    def grow(self, rows: int):
+        extra = rows - len(self.head)
+        self.current = np.vstack([self.current, np.full((extra, 6), np.nan)])
+        self.start = np.vstack([self.start, np.zeros((extra, self.capacity), dtype=np.int64)])
+        self.ohlc = np.concatenate([self.ohlc, np.zeros((extra, self.capacity, 4))])
+        self.volume = np.vstack([self.volume, np.zeros((extra, self.capacity), dtype=np.int64)])
+        self.head = np.concatenate([self.head, np.zeros(extra, dtype=np.int64)])
+        self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+
+    def close_current(self, row: int) -> Tuple:
+        """Move the bar in progress into the ring; returns it as a tuple"""
+        bar = self.current[row]
+        slot = self.head[row]
+        self.start[row, slot] = int(bar[START])
+        self.ohlc[row, slot] = bar[OPEN:VOLUME]
+        self.volume[row, slot] = int(bar[VOLUME])
+        self.head[row] = (slot + 1) % self.capacity
+        self.count[row] = min(self.count[row] + 1, self.capacity)
+        closed = (int(bar[START]), bar[OPEN], bar[HIGH], bar[LOW], bar[CLOSE], int(bar[VOLUME]))
+        self.current[row] = np.nan
+        return closed
+
+class IntradayBarAggregator:
+    """Streaming 1m/5m/1h OHLCV bars folded from quote ticks
+
+    Each tick updates the bar in progress of every interval in O(1). Closed
+    bars go into fixed-capacity ring buffers (one row per symbol) for fast
+    reads, and closed bars of the finest interval are queued and written to
+    ``stock_data`` in batches of ``flush_size`` rather than once per tick.
+    Quote volume is the cumulative session volume, so bar volume is the
+    difference between consecutive ticks.
+    """
+
+    def __init__(self, db_manager=None, intervals: Optional[List[str]] = None,
+                 capacity: Optional[int] = None, flush_size: Optional[int] = None,
+                 initial_symbols: int = 256, writer=None):
+        self.db_manager = db_manager
+        self.writer = writer
+        self.intervals = intervals or Config.INTRADAY_INTERVALS
+        self.capacity = capacity or Config.INTRADAY_BAR_CAPACITY
+        self.flush_size = flush_size or Config.INTRADAY_FLUSH_SIZE
+        self.persist_interval = min(self.intervals, key=lambda name: INTERVAL_SECONDS[name])
+
+        self._rows = {}  # symbol -> row index
+        self._symbols = []
+        self._last_volume = np.full(initial_symbols, np.nan)
+        self._buffers = {
+            name: _IntervalBuffers(INTERVAL_SECONDS[name], self.capacity, initial_symbols)
+            for name in self.intervals
+        }
+        self._pending = []  # closed bars awaiting a DB flush
+        self._lock = threading.Lock()
+        self.ticks = 0
+
+    def add_tick(self, symbol: str, price: float, cumulative_volume: float, timestamp: float):
+        """Fold one quote (epoch seconds) into every interval"""
+        with self._lock:
+            row = self._row(symbol)
+
+            last_volume = self._last_volume[row]
+            if np.isnan(last_volume) or cumulative_volume < last_volume:
+                # First tick, or the session volume counter reset
+                traded = 0
+            else:
+                traded = cumulative_volume - last_volume
+            self._last_volume[row] = cumulative_volume
+
+            for name, buffers in self._buffers.items():
+                bucket = int(timestamp // buffers.seconds) * buffers.seconds
+                bar = buffers.current[row]
+
+                if not np.isnan(bar[START]) and bucket > bar[START]:
+                    closed = buffers.close_current(row)
+                    if name == self.persist_interval:
+                        self._pending.append((symbol,) + closed)
+
+                if np.isnan(bar[START]):
+                    bar[START] = bucket
+                    bar[OPEN] = bar[HIGH] = bar[LOW] = price
+                    bar[VOLUME] = 0
+                elif bucket < bar[START]:
+                    # Late tick for an already closed bar; ignore it
+                    continue
+                else:
+                    bar[HIGH] = max(bar[HIGH], price)
+                    bar[LOW] = min(bar[LOW], price)
+                bar[CLOSE] = price
+                bar[VOLUME] += traded
+
+            self.ticks += 1
+            should_flush = len(self._pending) >= self.flush_size
+
+        if should_flush:
+            self.flush()
+
+    def add_quotes(self, quotes: Dict[str, Dict]):
+        """Fold a batch of collector quotes (keyed by symbol) into the bars
+
+        Simulated fallback quotes are skipped so they never become stored bars.
+        """
+        for symbol, quote in quotes.items():
+            if is_simulated(quote):
+                continue
+            timestamp = quote.get('timestamp') or datetime.now()
+            self.add_tick(symbol, quote['current_price'], quote.get('volume', 0), timestamp.timestamp())
+
+    def close_idle(self, now: Optional[float] = None):
+        """Close bars whose interval has ended even if no newer tick arrived"""
+        now = now if now is not None else datetime.now().timestamp()
+        with self._lock:
+            for name, buffers in self._buffers.items():
+                rows = np.flatnonzero(buffers.current[:len(self._symbols), START] + buffers.seconds <= now)
+                for row in rows:
+                    closed = buffers.close_current(row)
+                    if name == self.persist_interval:
+                        self._pending.append((self._symbols[row],) + closed)
+
+    def flush(self) -> int:
+        """Write queued closed bars to ``stock_data`` in one batch"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending or (self.db_manager is None and self.writer is None):
+            return 0
+
+        rows = [
+            {
+                'symbol': symbol,
+                'timestamp': datetime.fromtimestamp(start),
+                'open_price': open_price,
+                'close_price': close_price,
+                'high_price': high_price,
+                'low_price': low_price,
+                'volume': volume,
+                'change_percent': (close_price - open_price) / open_price * 100 if open_price else 0.0
+            }
+            for symbol, start, open_price, high_price, low_price, close_price, volume in pending
+        ]
+        try:
+            if self.writer is not None:
+                self.writer.put_many('stock_data', rows)
+            else:
+                self.db_manager.insert_stock_data_many(rows)
+        except Exception as e:
+            logger.error(f"Error flushing {len(rows)} intraday bars: {e}")
+            with self._lock:
+                self._pending = pending + self._pending
+            return 0
+        return len(rows)
+
+    def get_bars(self, symbol: str, interval: str = '1m', limit: Optional[int] = None,
+                 include_current: bool = True) -> BarSeries:
+        """Recent bars for a symbol, oldest first, as a BarSeries (epoch-second dates)"""
+        with self._lock:
+            buffers = self._buffers[interval]
+            row = self._rows.get(symbol)
+            if row is None:
+                return BarSeries.empty(symbol, unit='s')
+
+            count = buffers.count[row]
+            order = (buffers.head[row] - count + np.arange(count)) % buffers.capacity
+            start = buffers.start[row, order]
+            ohlc = buffers.ohlc[row, order]
+            volume = buffers.volume[row, order]
+
+            current = buffers.current[row]
+            if include_current and not np.isnan(current[START]):
+                start = np.append(start, int(current[START]))
+                ohlc = np.vstack([ohlc, current[OPEN:VOLUME]])
+                volume = np.append(volume, int(current[VOLUME]))
+
+        if limit:
+            start, ohlc, volume = start[-limit:], ohlc[-limit:], volume[-limit:]
+
+        return BarSeries(
+            symbol,
+            start.astype('datetime64[s]'),
+            ohlc[:, 0].copy(), ohlc[:, 1].copy(), ohlc[:, 2].copy(), ohlc[:, 3].copy(),
+            volume.astype(np.int64)
+        )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'symbols': len(self._symbols),
+                'ticks': self.ticks,
+                'pending_flush': len(self._pending),
+                'intervals': list(self._buffers),
+                'capacity': self.capacity
+            }
+
+    def _row(self, symbol: str) -> int:
+        row = self._rows.get(symbol)
+        if row is not None:
+            return row
+
+        row = len(self._symbols)
+        if row == len(self._last_volume):
+            rows = row * 2
+            self._last_volume = np.concatenate([self._last_volume, np.full(rows - row, np.nan)])
+            for buffers in self._buffers.values():
+                buffers.grow(rows)
+        self._rows[symbol] = row
+        self._symbols.append(symbol)
+        return row
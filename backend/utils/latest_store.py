@@ -0,0 +1,63 @@
+import threading
+import time
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class LatestValueStore:
+    """Thread-safe in-memory store of the newest value per (kind, symbol)
+
+    The ingestion daemon publishes here and API handlers read from here, so
+    serving a request never waits on an upstream provider.
+    """
+
+    def __init__(self):
+        self._values = {}  # kind -> {symbol: (published_at, value)}
+        self._lock = threading.Lock()
+
+    def publish(self, kind: str, symbol: str, value: Any):
+        with self._lock:
+            self._values.setdefault(kind, {})[symbol] = (time.time(), value)
+
+    def publish_many(self, kind: str, values: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            bucket = self._values.setdefault(kind, {})
+            for symbol, value in values.items():
+                bucket[symbol] = (now, value)
+
+    def get(self, kind: str, symbol: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """Latest value, or None if missing or older than max_age seconds"""
+        with self._lock:
+            entry = self._values.get(kind, {}).get(symbol)
+        if entry is None:
+            return None
+        published_at, value = entry
+        if max_age is not None and time.time() - published_at > max_age:
+            return None
+        return value
+
+    def get_many(self, kind: str, symbols, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Latest values for the symbols that have a fresh enough one"""
+        values = {}
+        for symbol in symbols:
+            value = self.get(kind, symbol, max_age)
+            if value is not None:
+                values[symbol] = value
+        return values
+
+    def stats(self) -> Dict[str, Dict]:
+        now = time.time()
+        with self._lock:
+            return {
+                kind: {
+                    'symbols': len(bucket),
+                    'oldest_age': round(now - min(t for t, _ in bucket.values()), 2) if bucket else None,
+                    'newest_age': round(now - max(t for t, _ in bucket.values()), 2) if bucket else None
+                }
+                for kind, bucket in self._values.items()
+            }
+
+# Shared store read by the API and written by the ingestion daemon
+latest_values = LatestValueStore()
@@ -0,0 +1,25 @@
+import threading
+from typing import Any, Callable
+
+class LazyShared:
+    """Class attribute built on first access and then shared by every instance
+
+    ``factory`` receives the owning class, so one shared resource can be
+    built from another (e.g. a store from the class's ``db_manager``).
+    Importing the class therefore opens no databases or files. Assigning
+    the attribute on an instance overrides it for that instance only.
+    """
+
+    def __init__(self, factory: Callable[[type], Any]):
+        self.factory = factory
+        self._value = None
+        self._built = False
+        self._lock = threading.RLock()
+
+    def __get__(self, instance, owner):
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self._value = self.factory(owner)
+                    self._built = True
+        return self._value
@@ -0,0 +1,127 @@
+import uuid
+import logging
+from typing import Dict, List, Optional, Sequence
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # archive tier is disabled without pyarrow
+    pa = ds = pq = None
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+class ParquetArchive:
+    """Cold tier of aged-out rows stored as Parquet, partitioned by symbol and month
+
+    Files live under ``<root>/<table>/symbol=<SYMBOL>/month=<YYYY-MM>/``.
+    Each write rewrites the partitions it touches as one part file, merging
+    existing rows with the new ones on the table's key, so archiving the
+    same rows twice leaves a single copy. Reads use Arrow datasets, which
+    prune partitions from the symbol/month filters and push the timestamp
+    predicate down to the Parquet row groups.
+    """
+
+    def __init__(self, root: Optional[str] = None, compression: Optional[str] = None):
+        self.root = os.path.abspath(root or Config.ARCHIVE_PATH)
+        self.compression = compression or Config.ARCHIVE_COMPRESSION
+
+    @property
+    def available(self) -> bool:
+        return pq is not None
+
+    def has_table(self, table: str) -> bool:
+        return self.available and os.path.isdir(os.path.join(self.root, table))
+
+    def write(self, table: str, frame: pd.DataFrame, key: Sequence[str] = ('symbol', 'timestamp')) -> int:
+        """Merge rows (with ``symbol`` and ``timestamp`` columns) into the archive
+
+        Rows whose ``key`` is already archived replace the archived copy.
+        """
+        if frame.empty:
+            return 0
+        if not self.available:
+            raise RuntimeError("pyarrow is required for the Parquet archive")
+
+        frame = frame.copy()
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'], format='mixed')
+        frame['month'] = frame['timestamp'].dt.strftime('%Y-%m')
+
+        subset = [column for column in key if column != 'symbol']
+        for (symbol, month), part in frame.groupby(['symbol', 'month'], sort=False):
+            directory = os.path.join(self.root, table, f"symbol={symbol}", f"month={month}")
+            os.makedirs(directory, exist_ok=True)
+            self._rewrite_partition(directory, part.drop(columns=['symbol', 'month']), subset)
+
+        return len(frame)
+
+    def _rewrite_partition(self, directory: str, part: pd.DataFrame, subset: List[str]):
+        """Replace a partition's part files with one file of its old and new rows"""
+        names = os.listdir(directory)
+        existing = sorted(name for name in names if name.startswith('part-'))
+        for leftover in (name for name in names if name.startswith('.part-')):
+            # Staging file of an interrupted rewrite
+            os.remove(os.path.join(directory, leftover))
+        if existing:
+            archived = [pq.read_table(os.path.join(directory, name)).to_pandas() for name in existing]
+            part = pd.concat(archived + [part], ignore_index=True)
+            part = part.drop_duplicates(subset=subset, keep='last')
+        part = part.sort_values('timestamp', kind='stable')
+
+        # Hidden until renamed: datasets skip names starting with '.'
+        name = f"part-{uuid.uuid4().hex}.parquet"
+        staging = os.path.join(directory, f".{name}")
+        pq.write_table(pa.Table.from_pandas(part, preserve_index=False), staging, compression=self.compression)
+        os.replace(staging, os.path.join(directory, name))
+        for old in existing:
+            os.remove(os.path.join(directory, old))
+
+    def read(self, table: str, symbol: str, start: Optional[str] = None, end: Optional[str] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Archived rows for one symbol with ``start <= timestamp < end``, oldest first"""
+        if not self.has_table(table):
+            return pd.DataFrame(columns=columns)
+
+        frame = self._scan(table, symbol, start, end, columns).to_pandas()
+        if 'timestamp' in frame:
+            frame = frame.sort_values('timestamp', kind='stable')
+            frame['timestamp'] = frame['timestamp'].astype(str)
+        return frame.reset_index(drop=True)
+
+    def read_arrays(self, table: str, symbol: str, columns: List[str], start: Optional[str] = None,
+                    end: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Like ``read`` but as NumPy arrays, with ``timestamp`` as int64 epoch seconds"""
+        if not self.has_table(table):
+            return {column: np.empty(0) for column in columns}
+
+        arrow_table = self._scan(table, symbol, start, end, columns)
+        if 'timestamp' in columns:
+            arrow_table = arrow_table.sort_by('timestamp')
+        arrays = {}
+        for column in columns:
+            values = arrow_table.column(column)
+            if column == 'timestamp':
+                values = values.cast(pa.timestamp('s'), safe=False).cast(pa.int64())
+            arrays[column] = values.to_numpy()
+        return arrays
+
+    def _scan(self, table: str, symbol: str, start: Optional[str], end: Optional[str],
+              columns: Optional[List[str]]):
+        dataset = ds.dataset(os.path.join(self.root, table), format='parquet', partitioning='hive')
+        predicate = ds.field('symbol') == symbol
+        if start is not None:
+            start_ts = pd.Timestamp(start)
+            predicate &= (ds.field('month') >= start_ts.strftime('%Y-%m')) & (ds.field('timestamp') >= start_ts)
+        if end is not None:
+            end_ts = pd.Timestamp(end)
+            predicate &= (ds.field('month') <= end_ts.strftime('%Y-%m')) & (ds.field('timestamp') < end_ts)
+        return dataset.to_table(columns=columns, filter=predicate)
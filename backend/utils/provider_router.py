@@ -0,0 +1,197 @@
+import threading
+import time
+import logging
+from collections import deque
+from typing import Dict, List, Optional
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class ProviderError(Exception):
+    """Transport or HTTP failure talking to a provider (counts against its circuit)"""
+
+class ProviderHealth:
+    """Rolling latency/error window and circuit state for one provider"""
+
+    def __init__(self, name: str, window: int, horizon: float):
+        self.name = name
+        self.horizon = horizon
+        self.samples = deque(maxlen=window)  # (recorded_at, latency seconds, ok)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+        self.last_error = None
+
+    def expire(self, now: float):
+        """Forget samples older than the horizon so demoted providers get retried"""
+        while self.samples and now - self.samples[0][0] > self.horizon:
+            self.samples.popleft()
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        latencies = [latency for _, latency, ok in self.samples if ok]
+        if not latencies:
+            return None
+        return float(np.percentile(latencies, percentile))
+
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, _, ok in self.samples if not ok) / len(self.samples)
+
+class ProviderRouter:
+    """Latency-aware provider ordering with per-provider circuit breakers
+
+    Providers are ranked by median latency of recent successful calls;
+    those with a high error rate sink to the back, and providers with a
+    request budget (``Config.RATE_LIMITS``) are kept behind unmetered ones
+    so they serve as fallbacks rather than burning their quota. After
+    ``failure_threshold`` consecutive failures a provider's circuit opens and
+    it is skipped until ``cooldown`` seconds pass, after which a single probe
+    call decides whether it closes again. The probe is claimed by ``begin``
+    when a call is actually made, not when the provider is merely ranked.
+    """
+
+    def __init__(self, window: Optional[int] = None, failure_threshold: Optional[int] = None,
+                 cooldown: Optional[float] = None, max_error_rate: Optional[float] = None,
+                 reserve_providers: Optional[List[str]] = None):
+        self.window = window or Config.PROVIDER_HEALTH_WINDOW
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.cooldown = cooldown or Config.CIRCUIT_COOLDOWN
+        self.max_error_rate = max_error_rate if max_error_rate is not None else Config.PROVIDER_MAX_ERROR_RATE
+        self.reserve_providers = set(reserve_providers if reserve_providers is not None else Config.RATE_LIMITS)
+        self._providers = {}
+        self._lock = threading.Lock()
+
+    def route(self, providers: List[str]) -> List[str]:
+        """Order the given providers fastest-healthy-first, leaving out open circuits"""
+        now = time.monotonic()
+        ranked = []
+
+        with self._lock:
+            for index, name in enumerate(providers):
+                health = self._health(name)
+                health.expire(now)
+
+                if health.state == OPEN:
+                    if now - health.opened_at < self.cooldown:
+                        continue
+                    health.state = HALF_OPEN
+                    health.probe_started_at = None
+
+                if health.state == HALF_OPEN and self._probing(health, now):
+                    continue
+
+                median = health.latency_percentile(50)
+                degraded = (
+                    len(health.samples) >= Config.PROVIDER_MIN_SAMPLES
+                    and health.error_rate() > self.max_error_rate
+                )
+                reserve = name in self.reserve_providers
+                # Providers with no samples yet keep their configured order
+                ranked.append((
+                    degraded,
+                    reserve,
+                    median if median is not None else float('inf'),
+                    index,
+                    name
+                ))
+
+        return [entry[-1] for entry in sorted(ranked)]
+
+    def begin(self, provider: str) -> bool:
+        """Claim a call to ``provider``; False when its circuit does not allow one now
+
+        A half-open provider admits a single probe; the claim is held until
+        the outcome is recorded or released.
+        """
+        now = time.monotonic()
+        with self._lock:
+            health = self._health(provider)
+            if health.state == OPEN:
+                if now - health.opened_at < self.cooldown:
+                    return False
+                health.state = HALF_OPEN
+                health.probe_started_at = None
+            if health.state == HALF_OPEN:
+                if self._probing(health, now):
+                    return False
+                health.probe_started_at = now
+            return True
+
+    def release(self, provider: str):
+        """End a claimed call that says nothing about provider health (e.g. no data for a symbol)"""
+        with self._lock:
+            self._health(provider).probe_started_at = None
+
+    def record(self, provider: str, latency: float, ok: bool, error: Optional[str] = None):
+        """Record the outcome of one provider call"""
+        with self._lock:
+            health = self._health(provider)
+            health.samples.append((time.monotonic(), latency, ok))
+
+            if ok:
+                health.consecutive_failures = 0
+                if health.state != CLOSED:
+                    logger.info(f"Circuit for {provider} closed")
+                health.state = CLOSED
+                health.probe_started_at = None
+                return
+
+            health.consecutive_failures += 1
+            health.last_error = error
+            if health.state == HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+                if health.state != OPEN:
+                    logger.warning(f"Circuit for {provider} opened after {health.consecutive_failures} failures ({error})")
+                health.state = OPEN
+                health.opened_at = time.monotonic()
+                health.probe_started_at = None
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        """Latency after which a hedge request to the next provider should start"""
+        with self._lock:
+            health = self._health(provider)
+            if len(health.samples) < Config.HEDGE_MIN_SAMPLES:
+                return None
+            return health.latency_percentile(Config.HEDGE_PERCENTILE)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Current health of every provider seen so far"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    'state': health.state,
+                    'consecutive_failures': health.consecutive_failures,
+                    'error_rate': round(health.error_rate(), 4),
+                    'samples': len(health.samples),
+                    'p50_latency': health.latency_percentile(50),
+                    'p95_latency': health.latency_percentile(95),
+                    'retry_in': (
+                        max(0.0, round(self.cooldown - (now - health.opened_at), 2))
+                        if health.state == OPEN else 0.0
+                    ),
+                    'last_error': health.last_error
+                }
+                for name, health in self._providers.items()
+            }
+
+    def _probing(self, health: ProviderHealth, now: float) -> bool:
+        # One probe at a time; a probe never reported back expires after another cooldown
+        return health.probe_started_at is not None and now - health.probe_started_at < self.cooldown
+
+    def _health(self, provider: str) -> ProviderHealth:
+        if provider not in self._providers:
+            self._providers[provider] = ProviderHealth(provider, self.window, Config.PROVIDER_HEALTH_HORIZON)
+        return self._providers[provider]
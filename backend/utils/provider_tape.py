@@ -0,0 +1,256 @@
+import gzip
+import json
+import base64
+import asyncio
+import threading
+import time
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import sys
+import os
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+OFF = 'off'
+RECORD = 'record'
+REPLAY = 'replay'
+
+# Query parameters never written to the tape
+SECRET_PARAMS = {'apikey', 'api_key', 'token', 'access_token'}
+
+class TapeMiss(LookupError):
+    """Replay mode has no recorded response for a request"""
+
+class TapeResponse:
+    """Minimal stand-in for ``requests.Response`` built from a recorded body"""
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+class ProviderTape:
+    """Record raw provider responses to a gzip JSONL tape and replay them offline
+
+    In ``record`` mode every wrapped provider call is executed and its raw
+    response appended, with its latency, to a compressed append-only file.
+    In ``replay`` mode the same calls are served from the tape, cycling
+    through the responses recorded for each request. Each takes its recorded
+    latency and is not served before its recorded offset into the session,
+    both divided by ``speed`` (``speed <= 0`` replays without delay), so the
+    recorded burst pattern is reproduced. In ``off`` mode calls pass
+    straight through. Keys must not embed the current date (use ranges
+    relative to today), or a tape only replays on the day it was recorded.
+    """
+
+    def __init__(self, mode: Optional[str] = None, path: Optional[str] = None,
+                 speed: Optional[float] = None):
+        self.mode = (mode or Config.PROVIDER_TAPE_MODE).lower()
+        self.path = os.path.abspath(path or Config.PROVIDER_TAPE_PATH)
+        self.speed = Config.PROVIDER_TAPE_SPEED if speed is None else speed
+        self._lock = threading.Lock()
+        self._writer = None
+        self._entries = None  # (provider, key) -> list of recorded entries
+        self._cursors = defaultdict(int)
+        self._started = time.monotonic()
+
+        if self.mode not in (OFF, RECORD, REPLAY):
+            raise ValueError(f"Unknown provider tape mode: {self.mode}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != OFF
+
+    def call(self, provider: str, key: str, fetch: Callable[[], Any],
+             encode: Optional[Callable[[Any], Any]] = None,
+             decode: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Run ``fetch()`` through the tape
+
+        ``encode``/``decode`` convert the response to and from JSON-safe
+        data; DataFrames, bytes and plain JSON values are handled by default.
+        """
+        if self.mode == REPLAY:
+            entry = self._next_entry(provider, key)
+            delay = self._replay_delay(entry)
+            if delay:
+                time.sleep(delay)
+            return self._decode(entry['payload'], decode)
+
+        started = time.monotonic()
+        value = fetch()
+        if self.mode == RECORD:
+            self._append(provider, key, time.monotonic() - started, self._encode(value, encode))
+        return value
+
+    async def acall(self, provider: str, key: str, fetch: Callable[[], Awaitable[Any]],
+                    encode: Optional[Callable[[Any], Any]] = None,
+                    decode: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Async variant of ``call`` for coroutine-based providers"""
+        if self.mode == REPLAY:
+            entry = self._next_entry(provider, key)
+            delay = self._replay_delay(entry)
+            if delay:
+                await asyncio.sleep(delay)
+            return self._decode(entry['payload'], decode)
+
+        started = time.monotonic()
+        value = await fetch()
+        if self.mode == RECORD:
+            self._append(provider, key, time.monotonic() - started, self._encode(value, encode))
+        return value
+
+    def http_get(self, provider: str, session, url: str, params: Optional[Dict] = None, **kwargs):
+        """``session.get`` through the tape; replay returns a ``TapeResponse``"""
+        if not self.enabled:
+            return session.get(url, params=params, **kwargs)
+
+        def fetch():
+            response = session.get(url, params=params, **kwargs)
+            return TapeResponse(response.status_code, response.content)
+
+        return self.call(
+            provider, self.request_key(url, params), fetch,
+            encode=lambda r: {'status_code': r.status_code, 'content': base64.b64encode(r.content).decode('ascii')},
+            decode=lambda p: TapeResponse(p['status_code'], base64.b64decode(p['content']))
+        )
+
+    @staticmethod
+    def request_key(url: str, params: Optional[Dict] = None) -> str:
+        """Stable tape key for a URL + params with secrets stripped"""
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query) + sorted((params or {}).items())
+        query = sorted((k, str(v)) for k, v in query if k.lower() not in SECRET_PARAMS)
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def _append(self, provider: str, key: str, latency: float, payload: Any):
+        record = {
+            'provider': provider,
+            'key': key,
+            'offset': round(time.monotonic() - self._started, 6),
+            'latency': round(latency, 6),
+            'payload': payload
+        }
+        line = (json.dumps(record, default=str) + '\n').encode('utf-8')
+
+        with self._lock:
+            if self._writer is None:
+                directory = os.path.dirname(self.path)
+                if not os.path.exists(directory):
+                    os.makedirs(directory)
+                # Appending opens a new gzip member; readers see one stream
+                self._writer = gzip.open(self.path, 'ab')
+            self._writer.write(line)
+            self._writer.flush()
+
+    def _next_entry(self, provider: str, key: str) -> Dict:
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            entries = self._entries.get((provider, key))
+            if not entries:
+                raise TapeMiss(f"No recorded {provider} response for {key}")
+            cursor = self._cursors[(provider, key)]
+            self._cursors[(provider, key)] = (cursor + 1) % len(entries)
+            return entries[cursor]
+
+    def _load(self) -> Dict:
+        entries = defaultdict(list)
+        if not os.path.exists(self.path):
+            logger.warning(f"Provider tape {self.path} not found; every replayed call will miss")
+            return entries
+
+        count = 0
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as tape:
+                for line in tape:
+                    record = json.loads(line)
+                    entries[(record['provider'], record['key'])].append(record)
+                    count += 1
+        except (EOFError, OSError, ValueError) as e:
+            # A recorder killed mid-write leaves a truncated last member
+            logger.warning(f"Provider tape truncated after {count} records: {e}")
+
+        logger.info(f"Loaded {count} recorded responses from {self.path}")
+        return entries
+
+    def _replay_delay(self, entry: Dict) -> float:
+        if self.speed <= 0:
+            return 0.0
+        # Offsets are taken once the response arrived, i.e. after its latency
+        due = entry.get('offset', 0.0) / self.speed - (time.monotonic() - self._started)
+        return max(entry['latency'] / self.speed, due)
+
+    @staticmethod
+    def _encode(value: Any, encode: Optional[Callable[[Any], Any]]) -> Dict:
+        if encode is not None:
+            return {'type': 'custom', 'data': encode(value)}
+        if isinstance(value, pd.DataFrame):
+            return {'type': 'frame', 'data': _frame_to_json(value)}
+        if isinstance(value, bytes):
+            return {'type': 'bytes', 'data': base64.b64encode(value).decode('ascii')}
+        return {'type': 'json', 'data': value}
+
+    @staticmethod
+    def _decode(payload: Dict, decode: Optional[Callable[[Any], Any]]) -> Any:
+        if payload['type'] == 'custom':
+            return decode(payload['data']) if decode is not None else payload['data']
+        if payload['type'] == 'frame':
+            return _frame_from_json(payload['data'])
+        if payload['type'] == 'bytes':
+            return base64.b64decode(payload['data'])
+        return payload['data']
+
+def _frame_to_json(frame: pd.DataFrame) -> Dict:
+    """DataFrame with a datetime index (and flat or 2-level columns) to JSON-safe data
+
+    The index is stored as UTC epoch nanoseconds plus its timezone name, so
+    windows spanning a DST change (mixed UTC offsets) round-trip intact.
+    """
+    multi = isinstance(frame.columns, pd.MultiIndex)
+    index = pd.DatetimeIndex(frame.index)
+    tz = str(index.tz) if index.tz is not None else None
+    utc = index.tz_convert('UTC').tz_localize(None) if tz else index
+    return {
+        'index': utc.as_unit('ns').asi8.tolist(),
+        'tz': tz,
+        'columns': [list(col) for col in frame.columns] if multi else list(frame.columns),
+        'multi': multi,
+        'values': frame.astype(float).values.tolist()
+    }
+
+def _frame_from_json(data: Dict) -> pd.DataFrame:
+    columns = (
+        pd.MultiIndex.from_tuples([tuple(col) for col in data['columns']])
+        if data['multi'] else data['columns']
+    )
+    if 'tz' not in data:
+        # Tapes recorded before epochs were stored hold ISO strings
+        index = pd.to_datetime(data['index'], utc=False) if data['index'] else pd.DatetimeIndex([])
+    elif data['tz']:
+        index = pd.to_datetime(data['index'], unit='ns', utc=True).tz_convert(data['tz'])
+    else:
+        index = pd.to_datetime(data['index'], unit='ns')
+    return pd.DataFrame(data['values'], index=index, columns=columns)
+
+# Shared tape used by every collector; configure with PROVIDER_TAPE_*
+provider_tape = ProviderTape()
@@ -0,0 +1,246 @@
+import dataclasses
+import functools
+import inspect
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+import sqlite3
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+from utils.bars import BarSeries
+
+logger = logging.getLogger(__name__)
+
+class VersionedQueryCache:
+    """Result cache for database reads, invalidated by write versions instead of a TTL
+
+    Every entry is tagged with the write version of the (table, symbol) it
+    was read from, and write paths bump that version. An entry therefore
+    stays valid until rows for its table and symbol change, and is then
+    recomputed on the next read. With ``connect`` (a factory for connections
+    to the database being cached) versions live in its ``query_versions``
+    table, so writes made through any process or ``DatabaseManager``
+    invalidate entries everywhere; ``PRAGMA data_version`` tells when that
+    table must be re-read, so a hit costs one pragma rather than a query.
+    Without it versions are private to this instance. Entries are evicted
+    least recently used once their estimated size exceeds ``max_bytes``.
+
+    Hits share the cached value instead of copying it: its arrays are made
+    read-only, and lists of rows are handed out as fresh row dicts.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None,
+                 connect: Optional[Callable[[], sqlite3.Connection]] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else Config.QUERY_CACHE_MAX_BYTES
+        self.connect = connect
+        self._entries = OrderedDict()  # key -> (version tag, value, size in bytes)
+        self._versions = {}  # (table, symbol or '' for table-wide writes) -> version
+        self._conn = None  # opened on first use, reopened after a fork
+        self._pid = None
+        self._data_version = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'invalidated': 0, 'evictions': 0, 'uncacheable': 0}
+
+    def bump(self, table: str, symbols: Optional[Iterable[str]] = None):
+        """Record a write to ``symbols`` of a table (the whole table when None)"""
+        keys = [(table, '')] if symbols is None else [(table, symbol) for symbol in set(symbols)]
+        with self._lock:
+            if self.connect is None:
+                for key in keys:
+                    self._versions[key] = self._versions.get(key, 0) + 1
+                return
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.executemany('''
+                        INSERT INTO query_versions (table_name, symbol, version) VALUES (?, ?, 1)
+                        ON CONFLICT(table_name, symbol) DO UPDATE SET version = version + 1
+                    ''', keys)
+                # Our own commits leave data_version alone, so force a reload
+                self._data_version = None
+            except sqlite3.Error as e:
+                # Other processes miss this write, but this one must not serve stale rows
+                logger.error(f"Error recording write version for {table}: {e}")
+                self._entries.clear()
+                self._bytes = 0
+
+    def get_or_load(self, key: Hashable, table: str, symbol: Optional[str], load: Callable[[], Any]) -> Any:
+        """Cached result of ``load()`` for key while the table/symbol version is unchanged
+
+        Results are shared with other callers and must not be mutated in
+        place (DataFrames are still copied unless pandas copy-on-write is on).
+        """
+        with self._lock:
+            try:
+                self._sync()
+            except sqlite3.Error as e:
+                logger.error(f"Error reading query cache versions: {e}")
+                self._counters['uncacheable'] += 1
+                tag = None
+            else:
+                tag = self._version(table, symbol)
+            entry = self._entries.get(key) if tag is not None else None
+            if entry is not None:
+                if entry[0] == tag:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return _share(entry[1])
+                self._counters['invalidated'] += 1
+                self._drop(key)
+            if tag is not None:
+                self._counters['misses'] += 1
+
+        value = load()
+        if tag is None:
+            return value
+        # The tag was taken before loading, so a write that lands meanwhile
+        # leaves this entry stale rather than hiding the new rows
+        _freeze(value)
+        self._store(key, tag, value)
+        return _share(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return dict(
+                self._counters,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                hit_rate=round(self._counters['hits'] / lookups, 4) if lookups else None
+            )
+
+    def _version(self, table: str, symbol: Optional[str]) -> tuple:
+        return (self._versions.get((table, ''), 0), self._versions.get((table, symbol or ''), 0))
+
+    def _connection(self) -> sqlite3.Connection:
+        """Dedicated connection for the shared versions (caller holds the lock)"""
+        if self._conn is None or self._pid != os.getpid():
+            conn = self.connect()
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS query_versions (
+                    table_name TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    PRIMARY KEY (table_name, symbol)
+                )
+            ''')
+            conn.commit()
+            self._conn, self._pid = conn, os.getpid()
+            self._data_version = None
+        return self._conn
+
+    def _sync(self):
+        """Re-read shared versions if any other connection committed since the last look"""
+        if self.connect is None:
+            return
+        conn = self._connection()
+        data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+        if data_version == self._data_version:
+            return
+        self._versions = {
+            (table, symbol): version
+            for table, symbol, version in conn.execute('SELECT table_name, symbol, version FROM query_versions')
+        }
+        self._data_version = data_version
+
+    def _store(self, key: Hashable, tag: tuple, value: Any):
+        size = _sizeof(value)
+        with self._lock:
+            if size > self.max_bytes:
+                self._counters['uncacheable'] += 1
+                return
+            self._drop(key)
+            self._entries[key] = (tag, value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._counters['evictions'] += 1
+
+    def _drop(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+def cached_query(table: str, by_symbol: bool = True):
+    """Serve a ``DatabaseManager`` read method through its ``query_cache``
+
+    Results are keyed by method name and bound arguments and tagged with
+    the version of ``table`` for the call's ``symbol`` argument (or of the
+    whole table when ``by_symbol`` is False).
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'query_cache', None)
+            if cache is None:
+                return method(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = tuple(bound.arguments.items())[1:]
+            symbol = bound.arguments.get('symbol') if by_symbol else None
+            return cache.get_or_load(
+                (method.__name__, arguments), table, symbol,
+                lambda: method(self, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
+
+def _freeze(value: Any):
+    """Make the arrays of a result read-only before it is cached"""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, BarSeries):
+        for field in dataclasses.fields(value):
+            array = getattr(value, field.name)
+            if isinstance(array, np.ndarray):
+                array.setflags(write=False)
+
+def _share(value: Any) -> Any:
+    """Hand a cached result to a caller without deep-copying it"""
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=not _copy_on_write())
+    if isinstance(value, BarSeries):
+        # New wrapper around the same read-only arrays
+        return dataclasses.replace(value)
+    if isinstance(value, list):
+        # Rows hold scalars, so a fresh dict per row is a full copy
+        return [dict(row) if isinstance(row, dict) else row for row in value]
+    return value
+
+def _copy_on_write() -> bool:
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option('mode.copy_on_write') is True
+
+def _sizeof(value: Any) -> int:
+    """Approximate memory held by a cached result"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(item) for item in value)
+    if hasattr(value, '__dict__'):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in vars(value).values())
+    return sys.getsizeof(value)
@@ -0,0 +1,141 @@
+import threading
+import time
+import logging
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+class QuoteCache:
+    """In-process TTL cache with bounded LRU size and stale-while-revalidate
+
+    Fresh entries are served directly. Expired entries are still served while
+    a single background refresh per key runs. Concurrent misses for the same
+    key share one upstream fetch, so provider traffic scales with the number
+    of distinct keys rather than the number of callers. ``ttl_for`` may give
+    individual values a different TTL (None keeps the default).
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_size: Optional[int] = None,
+                 refresh_workers: int = 4, ttl_for: Optional[Callable[[Any], Optional[float]]] = None):
+        self.ttl = ttl if ttl is not None else Config.QUOTE_CACHE_TTL
+        self.max_size = max_size if max_size is not None else Config.QUOTE_CACHE_MAX_SIZE
+        self.ttl_for = ttl_for
+        self._entries = OrderedDict()  # key -> (value, stored_at, ttl)
+        self._inflight = {}  # key -> Future for a miss being fetched
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='quote-refresh')
+        self._counters = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'evictions': 0
+        }
+
+    def get_or_fetch(self, key: str, fetch: Callable[[str], Any]) -> Any:
+        """Return the cached value for key, fetching or refreshing it as needed"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at, ttl = entry
+                self._entries.move_to_end(key)
+                if time.monotonic() - stored_at < ttl:
+                    self._counters['hits'] += 1
+                    return value
+
+                self._counters['stale_hits'] += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._executor.submit(self._refresh, key, fetch)
+                return value
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self._counters['misses'] += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self._counters['coalesced'] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch(key)
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get_fresh(self, key: str) -> Optional[Any]:
+        """Return the cached value only if it is within its TTL"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[1] >= entry[2]:
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any):
+        """Store a value, evicting the least recently used entries over capacity"""
+        ttl = self.ttl_for(value) if self.ttl_for is not None else None
+        with self._lock:
+            self._entries[key] = (value, time.monotonic(), self.ttl if ttl is None else ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one key, or everything when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _refresh(self, key: str, fetch: Callable[[str], Any]):
+        """Background refresh of a stale entry"""
+        try:
+            value = fetch(key)
+            self.set(key, value)
+            with self._lock:
+                self._counters['refreshes'] += 1
+        except Exception as e:
+            logger.error(f"Quote cache refresh error for {key}: {e}")
+            with self._lock:
+                self._counters['refresh_errors'] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def stats(self) -> Dict:
+        """Get cache counters and occupancy"""
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['stale_hits'] + self._counters['misses']
+            return {
+                **self._counters,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'refreshing': len(self._refreshing),
+                'hit_rate': round((lookups - self._counters['misses']) / lookups, 4) if lookups else 0.0
+            }
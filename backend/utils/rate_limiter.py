@@ -0,0 +1,133 @@
+import sqlite3
+import threading
+import time
+import logging
+import itertools
+from collections import deque
+from typing import Dict, Optional, Tuple
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+class TokenBucketLimiter:
+    """Token-bucket rate limiter shared across threads and worker processes
+
+    Bucket state lives in a small SQLite file and is refilled/consumed inside
+    a ``BEGIN IMMEDIATE`` transaction, so every process sharing the file sees
+    one bucket per provider. Within a process, waiters queue FIFO per provider
+    and give up once their deadline passes.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, limits: Optional[Dict[str, Tuple[int, float]]] = None):
+        self.db_path = os.path.abspath(db_path or Config.RATE_LIMIT_DB_PATH)
+        self.limits = limits if limits is not None else Config.RATE_LIMITS
+        self._local = threading.local()
+        self._condition = threading.Condition()
+        self._queues = {}
+        self._tickets = itertools.count()
+
+        directory = os.path.dirname(self.db_path)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with self._connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    provider TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+
+    def acquire(self, provider: str, timeout: Optional[float] = None) -> bool:
+        """Take one token for provider, waiting in line up to timeout seconds
+
+        Returns False if the deadline passes first. Providers without a
+        configured limit are always allowed.
+        """
+        if provider not in self.limits:
+            return True
+
+        timeout = Config.RATE_LIMIT_MAX_WAIT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        ticket = next(self._tickets)
+
+        with self._condition:
+            queue = self._queues.setdefault(provider, deque())
+            queue.append(ticket)
+
+        try:
+            while True:
+                with self._condition:
+                    # Only the head of the line may take tokens
+                    while queue[0] != ticket:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            logger.warning(f"Rate limit wait for {provider} exceeded {timeout:.1f}s")
+                            return False
+                        self._condition.wait(remaining)
+
+                acquired, wait = self._try_acquire(provider)
+                if acquired:
+                    return True
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Rate limit wait for {provider} exceeded {timeout:.1f}s")
+                    return False
+                time.sleep(min(wait, remaining))
+        finally:
+            with self._condition:
+                queue.remove(ticket)
+                self._condition.notify_all()
+
+    def _try_acquire(self, provider: str) -> Tuple[bool, float]:
+        """Refill and try to take a token atomically; returns (acquired, seconds to wait)"""
+        capacity, period = self.limits[provider]
+        rate = capacity / period
+        now = time.time()
+
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT tokens, updated_at FROM rate_limit_buckets WHERE provider = ?',
+                (provider,)
+            ).fetchone()
+
+            if row is None:
+                tokens = float(capacity)
+            else:
+                tokens = min(float(capacity), row[0] + max(0.0, now - row[1]) * rate)
+
+            acquired = tokens >= 1
+            if acquired:
+                tokens -= 1
+
+            conn.execute('''
+                INSERT INTO rate_limit_buckets (provider, tokens, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(provider) DO UPDATE SET
+                    tokens = excluded.tokens,
+                    updated_at = excluded.updated_at
+            ''', (provider, tokens, now))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return acquired, 0.0 if acquired else (1 - tokens) / rate
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread autocommit connection (re-opened after a fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
@@ -0,0 +1,206 @@
+import time
+import zlib
+from datetime import date, datetime
+from typing import Dict, List, Optional
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+from utils.bars import BarSeries
+
+# Reference prices shared by the collector fallback and the demo API
+BASE_PRICES = {
+    # Tech Giants
+    'AAPL': 175.43, 'GOOGL': 2847.92, 'MSFT': 378.85, 'AMZN': 3127.45,
+    'META': 487.23, 'NVDA': 875.28, 'NFLX': 445.67, 'ORCL': 112.45,
+    # Electric Vehicles & Energy
+    'TSLA': 248.73, 'NIO': 8.45, 'RIVN': 12.67, 'LCID': 3.89,
+    # Finance & Banking
+    'JPM': 145.23, 'BAC': 32.78, 'WFC': 42.15, 'GS': 387.92,
+    # Healthcare & Pharma
+    'JNJ': 162.45, 'PFE': 28.67, 'UNH': 523.78, 'ABBV': 147.23,
+    # Consumer & Retail
+    'WMT': 158.92, 'HD': 312.45, 'PG': 152.67, 'KO': 58.23,
+    # Aerospace & Defense
+    'BA': 198.45, 'LMT': 445.67, 'RTX': 89.23, 'NOC': 467.89
+}
+
+# ``source`` of generated fallback records; these must never be persisted
+SIMULATED_SOURCE = 'simulated'
+
+def is_simulated(record: Dict) -> bool:
+    return record.get('source') == SIMULATED_SOURCE
+
+SECTORS = {
+    'technology': ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'META', 'NVDA', 'NFLX', 'ORCL'],
+    'ev_energy': ['TSLA', 'NIO', 'RIVN', 'LCID'],
+    'finance': ['JPM', 'BAC', 'WFC', 'GS'],
+    'healthcare': ['JNJ', 'PFE', 'UNH', 'ABBV'],
+    'consumer': ['WMT', 'HD', 'PG', 'KO'],
+    'aerospace': ['BA', 'LMT', 'RTX', 'NOC']
+}
+
+DEFAULT_PRICE = 100.0
+TRADING_DAYS = 252
+
+# Stream tags, so market, sector and per-symbol draws never share a seed
+_MARKET, _SECTOR, _TRAITS, _PATH = range(4)
+
+class SyntheticMarket:
+    """Seeded, vectorized synthetic market for demo data, fallbacks and benchmarks
+
+    Daily log returns follow a GBM driven by one market factor, one factor per
+    sector and idiosyncratic noise, so symbols in the same sector move
+    together. The market factor, each sector factor and each symbol draw
+    from their own stream seeded by ``(seed, name, step)``, so a symbol's bars
+    do not depend on which other symbols are requested, and different
+    symbols follow different paths. ``step`` is the bar index the window
+    ends on (the end date by default; quotes use the current update
+    interval), so the same seed and arguments always yield the same bars
+    while quotes still move over time.
+    """
+
+    def __init__(self, seed: Optional[int] = None, annual_drift: float = 0.07,
+                 market_vol: float = 0.15, sector_vol: float = 0.10, idio_vol: float = 0.20):
+        self.seed = seed
+        self.annual_drift = annual_drift
+        self.market_vol = market_vol
+        self.sector_vol = sector_vol
+        self.idio_vol = idio_vol
+        self._sector_of = {
+            symbol: sector
+            for sector, symbols in SECTORS.items()
+            for symbol in symbols
+        }
+
+    def generate_bars(self, symbols: List[str], days: int, end_date: Optional[date] = None,
+                      seed: Optional[int] = None, step: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Generate daily OHLCV bars for a universe in one pass
+
+        Returns ``dates`` (datetime64[D], shape (days,)) and ``open``, ``high``,
+        ``low``, ``close``, ``volume``, each shaped (len(symbols), days).
+        """
+        seed = seed if seed is not None else self.seed
+        # Unseeded engines still derive every stream from one root per call
+        root = seed if seed is not None else np.random.SeedSequence().entropy
+        end = np.datetime64(end_date or date.today(), 'D')
+        dates = end - np.arange(days - 1, -1, -1)
+        step = int(end.astype(np.int64)) if step is None else step
+
+        sector_names = sorted(set(self._sector_of.get(s, 'other') for s in symbols))
+        sector_index = np.array([sector_names.index(self._sector_of.get(s, 'other')) for s in symbols], dtype=int)
+        base = np.array([BASE_PRICES.get(s, DEFAULT_PRICE) for s in symbols])
+
+        # Per-symbol characteristics, fixed for the seed
+        traits = np.array([
+            _stream(root, _TRAITS, symbol).standard_normal(4) for symbol in symbols
+        ]).reshape(len(symbols), 4)
+        beta = 1.0 + 0.2 * traits[:, 0]
+        base_volume = np.exp(np.log(5e6) + 1.0 * traits[:, 1])
+        shares = np.exp(np.log(2e9) + 0.8 * traits[:, 2])
+        pe_ratio = 25 + 5 * traits[:, 3]
+
+        # Per-symbol path draws: idiosyncratic shock, 3 intraday, volume noise
+        path = np.array([
+            _stream(root, _PATH, symbol, step).standard_normal((5, days)) for symbol in symbols
+        ]).reshape(len(symbols), 5, days)
+
+        # Correlated daily shocks: market + sector + idiosyncratic
+        dt = 1.0 / TRADING_DAYS
+        market = _stream(root, _MARKET, '', step).standard_normal(days)
+        sector = np.array([
+            _stream(root, _SECTOR, name, step).standard_normal(days) for name in sector_names
+        ]).reshape(len(sector_names), days)
+        idio = path[:, 0]
+
+        shock = (
+            self.market_vol * beta[:, None] * market[None, :]
+            + self.sector_vol * sector[sector_index]
+            + self.idio_vol * idio
+        )
+        variance = (self.market_vol * beta) ** 2 + self.sector_vol ** 2 + self.idio_vol ** 2
+        log_returns = (self.annual_drift - 0.5 * variance)[:, None] * dt + np.sqrt(dt) * shock
+
+        close = base[:, None] * np.exp(np.cumsum(log_returns, axis=1))
+        previous_close = np.concatenate([base[:, None], close[:, :-1]], axis=1)
+
+        # Intraday OHLC: overnight gap plus a range around open/close
+        daily_vol = np.sqrt(variance * dt)[:, None]
+        intraday = path[:, 1:4].transpose(1, 0, 2)
+        open_ = previous_close * np.exp(0.25 * daily_vol * intraday[0])
+        high = np.maximum(open_, close) * np.exp(0.5 * daily_vol * np.abs(intraday[1]))
+        low = np.minimum(open_, close) * np.exp(-0.5 * daily_vol * np.abs(intraday[2]))
+
+        # Volume rises with the size of the move
+        volume_noise = np.exp(0.3 * path[:, 4])
+        volume = base_volume[:, None] * volume_noise * (1 + 10 * np.abs(log_returns))
+
+        return {
+            'symbols': list(symbols),
+            'dates': dates,
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': volume.astype(np.int64),
+            'shares': shares,
+            'pe_ratio': pe_ratio
+        }
+
+    def history(self, symbol: str, days: int, end_date: Optional[date] = None) -> List[Dict]:
+        """Daily bars for one symbol in the collector's list-of-dicts shape"""
+        return self.history_series(symbol, days, end_date).to_records()
+
+    def history_series(self, symbol: str, days: int, end_date: Optional[date] = None) -> BarSeries:
+        """Daily bars for one symbol as a columnar BarSeries"""
+        bars = self.generate_bars([symbol], days, end_date)
+        return BarSeries(
+            symbol,
+            bars['dates'],
+            bars['open'][0],
+            bars['high'][0],
+            bars['low'][0],
+            bars['close'][0],
+            bars['volume'][0]
+        ).round(2)
+
+    def quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Current quotes in the collector's get_current_data shape"""
+        # A new step every update interval, so the fallback market moves
+        bars = self.generate_bars(symbols, 2, step=int(time.time() // Config.STOCK_DATA_UPDATE_INTERVAL))
+        close = bars['close']
+        change = close[:, -1] - close[:, -2]
+        change_percent = change / close[:, -2] * 100
+        timestamp = datetime.now()
+
+        return {
+            symbol: {
+                'symbol': symbol,
+                'current_price': round(float(close[i, -1]), 2),
+                'open_price': round(float(bars['open'][i, -1]), 2),
+                'high_price': round(float(bars['high'][i, -1]), 2),
+                'low_price': round(float(bars['low'][i, -1]), 2),
+                'volume': int(bars['volume'][i, -1]),
+                'change': round(float(change[i]), 2),
+                'change_percent': round(float(change_percent[i]), 2),
+                'market_cap': int(close[i, -1] * bars['shares'][i]),
+                'pe_ratio': round(float(bars['pe_ratio'][i]), 2),
+                'timestamp': timestamp,
+                'source': SIMULATED_SOURCE
+            }
+            for i, symbol in enumerate(symbols)
+        }
+
+    def quote(self, symbol: str) -> Dict:
+        return self.quotes([symbol])[symbol]
+
+def _stream(root: int, tag: int, name: str, step: int = 0) -> np.random.Generator:
+    """Independent generator for one (seed, tag, name, step)"""
+    return np.random.default_rng([root, tag, zlib.crc32(name.encode('utf-8')), step])
+
+# Shared engine; set SYNTHETIC_MARKET_SEED for reproducible output
+default_market = SyntheticMarket(seed=Config.SYNTHETIC_MARKET_SEED)
@@ -0,0 +1,146 @@
+import atexit
+import threading
+import time
+import logging
+from typing import Dict, List, Optional
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Table -> DatabaseManager bulk insert method
+BULK_INSERTS = {
+    'stock_data': 'insert_stock_data_many',
+    'sentiment_data': 'insert_sentiment_data_many',
+    'predictions': 'insert_prediction_many',
+    'news_articles': 'insert_news_articles_many',
+    'latest_prices': 'upsert_latest_prices'
+}
+
+class WriteBehindQueue:
+    """Background writer that coalesces rows into batched inserts
+
+    Rows are buffered per table and written with the ``DatabaseManager``
+    ``insert_*_many`` methods once a table holds ``batch_size`` rows or
+    ``flush_interval`` seconds have passed. Producers block once
+    ``max_pending`` rows are buffered (backpressure), and everything still
+    buffered is flushed on ``stop()`` and at interpreter exit.
+    """
+
+    def __init__(self, db_manager, batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None, max_pending: Optional[int] = None):
+        self.db_manager = db_manager
+        self.batch_size = batch_size or Config.WRITE_BEHIND_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.WRITE_BEHIND_FLUSH_INTERVAL
+        self.max_pending = max_pending or Config.WRITE_BEHIND_MAX_PENDING
+
+        self._buffers = {table: [] for table in BULK_INSERTS}
+        self._pending = 0
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()  # one writer at a time, in order
+        self._stopped = False
+        self._counters = {'rows_written': 0, 'batches': 0, 'errors': 0, 'blocked_puts': 0}
+
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def put(self, table: str, row: Dict, timeout: Optional[float] = None):
+        self.put_many(table, [row], timeout)
+
+    def put_many(self, table: str, rows: List[Dict], timeout: Optional[float] = None):
+        """Queue rows for a table, blocking while the queue is full
+
+        Raises ``TimeoutError`` if space does not free up within ``timeout``
+        seconds (wait indefinitely when None).
+        """
+        if table not in self._buffers:
+            raise ValueError(f"Unknown table for write-behind: {table}")
+        if not rows:
+            return
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Write-behind queue is stopped")
+
+            if self._pending >= self.max_pending:
+                self._counters['blocked_puts'] += 1
+                self._condition.notify_all()
+            while self._pending >= self.max_pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Write-behind queue full ({self._pending} rows pending)")
+                self._condition.wait(remaining)
+
+            self._buffers[table].extend(rows)
+            self._pending += len(rows)
+            if len(self._buffers[table]) >= self.batch_size:
+                self._condition.notify_all()
+
+    def flush(self):
+        """Write everything buffered so far; returns once it is committed"""
+        with self._flush_lock:
+            with self._condition:
+                batches = {table: rows for table, rows in self._buffers.items() if rows}
+                self._buffers = {table: [] for table in BULK_INSERTS}
+
+            for table, rows in batches.items():
+                self._write(table, rows)
+
+            with self._condition:
+                self._pending -= sum(len(rows) for rows in batches.values())
+                self._condition.notify_all()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the background thread and flush what is left"""
+        with self._condition:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> Dict:
+        with self._condition:
+            return dict(
+                self._counters,
+                pending=self._pending,
+                buffered={table: len(rows) for table, rows in self._buffers.items()}
+            )
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    full = any(len(rows) >= self.batch_size for rows in self._buffers.values())
+                    due = self._pending and time.monotonic() - last_flush >= self.flush_interval
+                    if full or due or self._pending >= self.max_pending:
+                        break
+                    self._condition.wait(max(0.0, self.flush_interval - (time.monotonic() - last_flush)))
+                if self._stopped:
+                    return
+
+            self.flush()
+            last_flush = time.monotonic()
+
+    def _write(self, table: str, rows: List[Dict]):
+        insert = getattr(self.db_manager, BULK_INSERTS[table])
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            try:
+                insert(batch)
+                with self._condition:
+                    self._counters['rows_written'] += len(batch)
+                    self._counters['batches'] += 1
+            except Exception as e:
+                # Drop the batch rather than wedge ingestion on a bad row
+                logger.error(f"Write-behind insert of {len(batch)} {table} rows failed: {e}")
+                with self._condition:
+                    self._counters['errors'] += 1